@@ -1,11 +1,14 @@
 # deployment/streamlit_main.py
 
+import importlib
+import logging
 import os
 import sys
+import threading
+import time
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+
+_script_start = time.perf_counter()
 
 # ✅ FIRST Streamlit command
 st.set_page_config(page_title="AI Insurance Assistant", layout="wide")
@@ -15,53 +18,60 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-# ─── 2) Try normal import; if that fails, fallback to loading by file ───────────
-imported_normally = True
-try:
-    from scripts import (
-        risk_classifier,
-        claim_predictor,
-        customer_segmentation,
-        fraud_detector,
-        multilingual_translator,
-        sentiment_predictor,
-        summarizer,
-        insurance_chatbot
-    )
-except ImportError:
-    imported_normally = False
-    import importlib.machinery, importlib.util
-
-    def load_script(name, fname):
-        path = os.path.join(ROOT, "scripts", fname)
-        loader = importlib.machinery.SourceFileLoader(name, path)
-        spec = importlib.util.spec_from_loader(loader.name, loader)
-        mod = importlib.util.module_from_spec(spec)
-        loader.exec_module(mod)
-        return mod
-
-    risk_classifier        = load_script("risk_classifier",       "risk_classifier.py")
-    claim_predictor        = load_script("claim_predictor",       "claim_predictor.py")
-    customer_segmentation  = load_script("customer_segmentation", "customer_segmentation.py")
-    fraud_detector         = load_script("fraud_detector",        "fraud_detector.py")
-    multilingual_translator = load_script("multilingual_translator", "multilingual_translator.py")
-    sentiment_predictor    = load_script("sentiment_predictor",   "sentiment_predictor.py")
-    summarizer             = load_script("summarizer",            "summarizer.py")
-    insurance_chatbot      = load_script("insurance_chatbot",     "insurance_chatbot.py")
+from scripts import instrumentation  # light: no model or ML imports
+
+# ─── 2) Lazy module registry ───────────────────────────────────────────────────
+# Each page's module (and its heavy dependencies: transformers, torch, spacy,
+# pdfplumber, deep_translator...) is imported the first time the page is opened.
+log = logging.getLogger("streamlit_main")
+if not log.handlers:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+PAGES = {
+    "🏠 Overview":                "overview_cache",
+    "📈 Risk Classification":     "risk_classifier",
+    "💰 Claim Prediction":        "claim_predictor",
+    "👥 Customer Segmentation":   "customer_segmentation",
+    "🕵️ Fraud Detection":         "fraud_detector",
+    "🌍 Multilingual Translator": "multilingual_translator",
+    "💬 Sentiment Analysis":      "sentiment_predictor",
+    "📄 Policy Summarizer":       "summarizer",
+    "🤖 Insurance Chatbot":       "insurance_chatbot",
+}
+
+# (module, loader) pairs warmed in the background when IIRA_PREWARM=1
+PREWARM = [
+    ("summarizer",          "load_spacy_model"),
+    ("sentiment_predictor", "load_sentiment_model"),
+    ("insurance_chatbot",   "load_insurance_bot"),
+]
+
+@instrumentation.cached_resource("streamlit_main.load_page_module", show_spinner="⏳ Loading module...")
+def load_page_module(name):
+    start  = time.perf_counter()
+    module = importlib.import_module(f"scripts.{name}")
+    log.info("Imported scripts.%s in %.2fs", name, time.perf_counter() - start)
+    return module
+
+@st.cache_resource(show_spinner=False)
+def start_prewarm():
+    # Runs once per server process, after the first page has been rendered
+    def prewarm():
+        for name, loader in PREWARM:
+            start = time.perf_counter()
+            try:
+                getattr(load_page_module(name), loader)()
+                log.info("Pre-warmed %s.%s in %.2fs", name, loader, time.perf_counter() - start)
+            except Exception as e:
+                log.warning("Pre-warm of %s.%s failed: %s", name, loader, e)
+
+    thread = threading.Thread(target=prewarm, name="iira-prewarm", daemon=True)
+    thread.start()
+    return thread
 
 # ─── 3) Build Streamlit UI ──────────────────────────────────────────────────────
 
-menu = [
-    "🏠 Overview",
-    "📈 Risk Classification",
-    "💰 Claim Prediction",
-    "👥 Customer Segmentation",
-    "🕵️ Fraud Detection",
-    "🌍 Multilingual Translator",
-    "💬 Sentiment Analysis",
-    "📄 Policy Summarizer",
-    "🤖 Insurance Chatbot"
-]
+menu = list(PAGES)
 choice = st.sidebar.selectbox("🔎 Choose Module", menu)
 
 if choice == "🏠 Overview":
@@ -69,35 +79,26 @@ if choice == "🏠 Overview":
     st.markdown("Welcome👋")
     st.markdown("Use the sidebar to navigate between modules.")
 
-    # ----------- Load Main Dataset -----------
-    data_path_FD = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\Dataset\Insurance_FD.csv"  # Your cleaned insurance dataset
-    FD_df = pd.read_csv(data_path_FD)
-
-    # Load Reviews Dataset
-    review_data_path = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\Dataset\Insurance_CFS.csv"
-    review_df = pd.read_csv(review_data_path)
-    # See first few rows to confirm
-
-    # Load Customer Segmentation dataset
-    data_path_CS = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\Dataset\Insurance_CS.csv"
-    CS_df = pd.read_csv(data_path_CS)
-
-    # Load Customer Segmentation dataset
-    data_path_RC = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\Dataset\Insurance_RC_CP.csv"
-    RC_df = pd.read_csv(data_path_RC)
+    # ----------- Precomputed Metrics & Charts -----------
+    # Rebuilt only when a file under Dataset/ changes (see scripts/overview_cache.py)
+    overview = load_page_module(PAGES[choice]).load_overview()
+    metrics  = overview["metrics"]
+    images   = overview["images"]
 
     st.subheader("📊 Key Metrics")
 
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Policyholders", f"{FD_df['Policyholder_ID'].nunique()}")
-    with col2:
-        st.metric("Total Claims", f"{FD_df.shape[0]}")
-    with col3:
-        st.metric("Total Claim Amount (₹)", f"{int(FD_df['Claim_Amount'].sum()):,}")
-    with col4:
-        fraud_percent = (FD_df['Fraud_Label'].sum() / FD_df.shape[0]) * 100
-        st.metric("Fraud Cases (%)", f"{fraud_percent:.2f}%")
+    if metrics is None:
+        st.info("ℹ️ Dataset/Insurance_FD.csv not found — key metrics unavailable.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Policyholders", f"{metrics['policyholders']}")
+        with col2:
+            st.metric("Total Claims", f"{metrics['claims']}")
+        with col3:
+            st.metric("Total Claim Amount (₹)", f"{metrics['claim_amount']:,}")
+        with col4:
+            st.metric("Fraud Cases (%)", f"{metrics['fraud_percent']:.2f}%")
 
 
     st.divider()
@@ -110,24 +111,13 @@ if choice == "🏠 Overview":
     # —————————— Row 1 ———————————
     with left_col:
         st.subheader("💬 Positive Reviews")
-        if "Sentiment_Label" in review_df.columns and "Review_Text" in review_df.columns:
-            text_positive = " ".join(review_df[review_df["Sentiment_Label"] == "Positive"]["Review_Text"].dropna())
-            if text_positive.strip():
-                wc = WordCloud(width=400, height=200, background_color="white", colormap="Greens").generate(text_positive)
-                fig, ax = plt.subplots(figsize=(4,2))
-                ax.imshow(wc, interpolation="bilinear")
-                ax.axis("off")
-                st.pyplot(fig)
+        if images.get("wordcloud_Positive"):
+            st.image(images["wordcloud_Positive"])
     
     with right_col:
         st.subheader("📊 Risk Levels by Policy Type")
-        if "Policy_Type" in RC_df.columns and "Risk_Score" in RC_df.columns:
-            risk_policy = RC_df.groupby(["Policy_Type", "Risk_Score"]).size().unstack(fill_value=0)
-            fig1, ax1 = plt.subplots(figsize=(5, 3))
-            risk_policy.plot(kind="bar", stacked=True, ax=ax1)
-            ax1.set_ylabel("Number of Policies")
-            ax1.set_title("Risk Distribution")
-            st.pyplot(fig1)
+        if images.get("risk_policy"):
+            st.image(images["risk_policy"])
     
     # —————————— Gap ———————————
     st.markdown("<br>", unsafe_allow_html=True)
@@ -137,23 +127,13 @@ if choice == "🏠 Overview":
     
     with left_col2:
         st.subheader("💬 Negative Reviews")
-        text_negative = " ".join(review_df[review_df["Sentiment_Label"] == "Negative"]["Review_Text"].dropna())
-        if text_negative.strip():
-            wc = WordCloud(width=400, height=200, background_color="white", colormap="Reds").generate(text_negative)
-            fig, ax = plt.subplots(figsize=(4,2))
-            ax.imshow(wc, interpolation="bilinear")
-            ax.axis("off")
-            st.pyplot(fig)
+        if images.get("wordcloud_Negative"):
+            st.image(images["wordcloud_Negative"])
     
     with right_col2:
         st.subheader("🌎 Policy Type by Location")
-        if "Policy Type" in CS_df.columns and "Location" in CS_df.columns:
-            policy_location = CS_df.groupby(["Location", "Policy Type"]).size().unstack(fill_value=0)
-            fig2, ax2 = plt.subplots(figsize=(5, 3))
-            policy_location.plot(kind="bar", stacked=True, ax=ax2)
-            ax2.set_ylabel("Number of Policies")
-            ax2.set_title("Policy vs Location")
-            st.pyplot(fig2)
+        if images.get("policy_location"):
+            st.image(images["policy_location"])
     
     # —————————— Gap ———————————
     st.markdown("<br>", unsafe_allow_html=True)
@@ -163,53 +143,32 @@ if choice == "🏠 Overview":
     
     with left_col3:
         st.subheader("💬 Neutral Reviews")
-        text_neutral = " ".join(review_df[review_df["Sentiment_Label"] == "Neutral"]["Review_Text"].dropna())
-        if text_neutral.strip():
-            wc = WordCloud(width=400, height=200, background_color="white", colormap="Greys").generate(text_neutral)
-            fig, ax = plt.subplots(figsize=(4,2))
-            ax.imshow(wc, interpolation="bilinear")
-            ax.axis("off")
-            st.pyplot(fig)
+        if images.get("wordcloud_Neutral"):
+            st.image(images["wordcloud_Neutral"])
     
     with right_col3:
         st.subheader("👩‍💼 Policy Type by Occupation")
-        if "Policy Type" in CS_df.columns and "Occupation" in CS_df.columns:
-            policy_occupation = CS_df.groupby(["Occupation", "Policy Type"]).size().unstack(fill_value=0)
-            fig3, ax3 = plt.subplots(figsize=(5, 3))
-            policy_occupation.plot(kind="bar", stacked=True, ax=ax3)
-            ax3.set_ylabel("Number of Policies")
-            ax3.set_title("Policy vs Occupation")
-            st.pyplot(fig3)
-
-
-
-elif choice == "📈 Risk Classification":
-    risk_classifier.run()
-
-elif choice == "💰 Claim Prediction":
-    claim_predictor.run()
-
-elif choice == "👥 Customer Segmentation":
-    customer_segmentation.run()
+        if images.get("policy_occupation"):
+            st.image(images["policy_occupation"])
 
-elif choice == "🕵️ Fraud Detection":
-    fraud_detector.run()
 
-elif choice == "🌍 Multilingual Translator":
-    multilingual_translator.run()
 
-elif choice == "💬 Sentiment Analysis":
-    sentiment_predictor.run()
+else:
+    load_page_module(PAGES[choice]).run()
 
-elif choice == "📄 Policy Summarizer":
-    summarizer.run()
+# ─── 4) Startup timing, diagnostics & optional pre-warm ─────────────────────────
+elapsed = time.perf_counter() - _script_start
+log.info("Rendered %s in %.2fs", choice, elapsed)
+instrumentation.observe(f"{PAGES[choice]}.page", elapsed)
+st.sidebar.caption(f"⏱️ Page rendered in {elapsed:.2f}s")
 
-elif choice == "🤖 Insurance Chatbot":
-    insurance_chatbot.run()
+# span timings and cache counters, recorded when IIRA_METRICS=1
+if instrumentation.enabled():
+    with st.sidebar.expander("🩺 Diagnostics"):
+        instrumentation.render_panel()
 
-# ─── 4) Footer info if fallback was used ───────────────────────────────────────
-if not imported_normally:
-    st.info("⚙️ Modules loaded via dynamic fallback loader (importlib).")
+if os.environ.get("IIRA_PREWARM", "0") == "1":
+    start_prewarm()
 
 
 #streamlit run C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\Deployment\streamlit_main.py
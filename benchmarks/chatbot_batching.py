@@ -0,0 +1,109 @@
+# benchmarks/chatbot_batching.py
+#
+# Simulated concurrent chatbot users: one generate call per question (the
+# model serialises them) vs scripts/generation_scheduler.py with and without
+# its response cache.
+#
+#   python -m benchmarks.chatbot_batching                       # simulated model
+#   python -m benchmarks.chatbot_batching --model models/flan_t5_insurance --users 8
+#
+# The simulated model sleeps ``fixed + per_item * batch`` seconds per call,
+# which is how an encoder-decoder behaves on CPU: most of the cost of a small
+# batch is per call, not per prompt.
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.generation_scheduler import GenerationScheduler
+
+ROOT     = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FAQ_PATH = os.path.join(ROOT, "Dataset", "insurance_faq_dataset.csv")
+
+class SimulatedGenerator:
+    def __init__(self, fixed=0.120, per_item=0.015):
+        self.fixed    = fixed
+        self.per_item = per_item
+        self.lock     = threading.Lock()
+
+    def __call__(self, prompts, **kwargs):
+        batch = [prompts] if isinstance(prompts, str) else prompts
+        with self.lock:   # one model, one call at a time
+            time.sleep(self.fixed + self.per_item * len(batch))
+        return [{"generated_text": f"answer to: {p[-40:]}"} for p in batch]
+
+def real_generator(model_path):
+    from transformers import T5ForConditionalGeneration, T5Tokenizer, pipeline
+    tokenizer = T5Tokenizer.from_pretrained(model_path)
+    model     = T5ForConditionalGeneration.from_pretrained(model_path)
+    generator = pipeline("text2text-generation", model=model, tokenizer=tokenizer)
+    lock      = threading.Lock()
+
+    def call(prompts, **kwargs):
+        with lock:
+            return generator(prompts, **kwargs)
+    return call
+
+def user_queries(n_users, per_user, seed=0):
+    """FAQ questions with a Zipf-like popularity and random casing/punctuation variants."""
+    questions = pd.read_csv(FAQ_PATH)["instruction"].tolist()
+    rng   = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(1.3, size=(n_users, per_user)) - 1, len(questions) - 1)
+    variants = (str.lower, str.upper, lambda q: q, lambda q: q.rstrip("?") + " ?")
+    return [[variants[rng.integers(len(variants))](questions[r]) for r in row] for row in ranks]
+
+def simulate(ask, queries):
+    latencies, lock = [], threading.Lock()
+
+    def user(qs):
+        for q in qs:
+            start = time.perf_counter()
+            ask(q)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=user, args=(qs,)) for qs in queries]
+    start   = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    lat  = np.asarray(latencies) * 1e3
+    return {"qps": len(lat) / wall, "p50": np.percentile(lat, 50), "p95": np.percentile(lat, 95), "wall": wall}
+
+def prompt(query):
+    return f"Answer the following INSURANCE-RELATED question accurately and politely:\n\nQuestion: {query}\n\nAnswer:"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chatbot throughput under concurrent users")
+    parser.add_argument("--model", help="path to a saved FLAN-T5 model; simulated if omitted")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--questions", type=int, default=10, help="questions per user")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    generator = real_generator(args.model) if args.model else SimulatedGenerator()
+    queries   = user_queries(args.users, args.questions)
+    kwargs    = {"max_length": 100, "do_sample": False}
+
+    def direct(q):
+        return generator(prompt(q), **kwargs)[0]["generated_text"]
+
+    configs = {"one call per question": lambda: direct}
+    for name, cache_size in (("scheduler, no cache", 0), ("scheduler + cache", 512)):
+        def make(cache_size=cache_size):
+            s = GenerationScheduler(generator, prompt, args.max_batch, args.max_wait_ms / 1000, cache_size, **kwargs)
+            return s.submit
+        configs[name] = make
+
+    print(f"{args.users} users x {args.questions} questions")
+    print(f"{'mode':<24} {'q/s':>8} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, make in configs.items():
+        r = simulate(make(), queries)
+        print(f"{name:<24} {r['qps']:>8.1f} {r['p50']:>10.1f} {r['p95']:>10.1f}")
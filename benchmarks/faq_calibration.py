@@ -0,0 +1,118 @@
+# benchmarks/faq_calibration.py
+#
+# Labelled questions for the FAQ retriever's answer thresholds: paraphrases
+# of each FAQ instruction (should be answered from it) and near misses or
+# unrelated questions (should fall through to generation).
+#
+#   python -m benchmarks.faq_calibration                 # current MIN_SCORE / MIN_COVERAGE
+#   python -m benchmarks.faq_calibration --grid          # plus the best settings on this set
+#
+# A wrong canned answer costs more than a generated one, so the grid ranks
+# settings by answered paraphrases minus twice the near misses let through.
+
+import argparse
+
+import numpy as np
+
+from scripts.faq_retriever import MIN_COVERAGE, MIN_SCORE, FAQRetriever
+
+PARAPHRASES = {
+    "How can I file a health insurance claim?": [
+        "how do i file a health insurance claim", "steps to file a health claim", "how to claim my health insurance",
+        "filing a claim on my health insurance", "how can i file health insurance claim online",
+    ],
+    "Is maternity covered under my health insurance?": [
+        "does my health insurance cover maternity", "is pregnancy covered in my health plan",
+        "maternity coverage in health insurance?", "are maternity expenses covered",
+    ],
+    "Can I cancel my insurance policy anytime?": [
+        "can i cancel my policy at any time", "how do i cancel my insurance policy",
+        "is it possible to cancel my insurance anytime", "cancel insurance policy",
+    ],
+    "Can I port my health insurance to another company?": [
+        "can i switch my health insurance to another insurer", "how to port health insurance",
+        "porting my health policy to a different company", "can i port my health insurance",
+    ],
+    "How can I renew my expired policy?": [
+        "how do i renew an expired policy", "my policy expired, how can i renew it", "renew expired insurance policy",
+        "can i renew my lapsed policy",
+    ],
+    "How do I add a nominee to my policy?": [
+        "how to add nominee in my policy", "adding a nominee to my insurance", "how can i add nominees to my policy",
+        "add nominee policy",
+    ],
+    "Is dental treatment covered under my policy?": [
+        "does my policy cover dental treatment", "is dental covered", "are dental treatments covered under the policy",
+        "dental treatment coverage",
+    ],
+    "What documents are required for claim settlement?": [
+        "which documents do i need for claim settlement", "documents required to settle a claim",
+        "what papers are needed for claim settlement", "claim settlement documents",
+    ],
+    "Where can I download my policy document?": [
+        "how do i download my policy document", "where to download policy document",
+        "download my insurance policy document", "where can i get a copy of my policy document",
+    ],
+    "Will my premium increase after a claim?": [
+        "does my premium go up after a claim", "will making a claim increase my premium",
+        "premium increase after claim?", "will my premium rise after i claim",
+    ],
+}
+
+NON_MATCHES = [
+    # near misses: close wording, different question
+    "How do I file a claim?", "how do i file a car insurance claim", "how to file a motor claim",
+    "is maternity covered under my life insurance", "can i cancel my claim", "how can i renew my driving licence",
+    "where can i download my premium receipt", "will my premium increase with age",
+    "is ambulance cost covered under my policy", "how long does claim settlement take",
+    "can i add my spouse to my policy", "what documents are required to buy a policy",
+    "can i port my mobile number", "is cosmetic surgery covered", "is covid covered",
+    # unrelated
+    "how do i change my address", "what is the claim status", "how do i reset my password", "what is a deductible",
+    "how do i file a complaint", "how can i pay my premium", "what is the weather today", "tell me a joke",
+    "who is the ceo",
+]
+
+def score_set(retriever, key_terms=True):
+    """(label, score, coverage, right_faq) per question; label True for paraphrases.
+
+    With ``key_terms`` a KEY_TERMS conflict scores the question 0, as lookup() refuses it.
+    """
+    rows = []
+    for label, questions in [(True, [(q, faq) for faq, qs in PARAPHRASES.items() for q in qs]),
+                             (False, [(q, None) for q in NON_MATCHES])]:
+        for q, faq in questions:
+            best, score, coverage = retriever.search(q)
+            if key_terms and retriever.conflict(q, best):
+                score = 0.0
+            rows.append((label, score, coverage, label and retriever.instructions[best] == faq))
+    return rows
+
+def evaluate(rows, min_score, min_coverage):
+    answered = [(label, right) for label, s, c, right in rows if s >= min_score and c >= min_coverage]
+    return {
+        "paraphrases_answered": sum(label and right for label, right in answered),
+        "paraphrases_total": sum(label for label, *_ in rows),
+        "wrong_answers": sum(not (label and right) for label, right in answered),
+        "non_matches_total": sum(not label for label, *_ in rows),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate the FAQ retriever's answer thresholds")
+    parser.add_argument("--grid", action="store_true", help="search min_score x min_coverage")
+    args = parser.parse_args()
+
+    retriever = FAQRetriever.build()
+    rows      = score_set(retriever)
+    print(f"current  min_score={MIN_SCORE} min_coverage={MIN_COVERAGE}: {evaluate(rows, MIN_SCORE, MIN_COVERAGE)}")
+    print(f"without key terms: {evaluate(score_set(retriever, key_terms=False), MIN_SCORE, MIN_COVERAGE)}")
+    print(f"cosine only  min_score={MIN_SCORE}: {evaluate(rows, MIN_SCORE, 0.0)}")
+    if args.grid:
+        grid = []
+        for min_score in np.arange(0.40, 0.81, 0.05):
+            for min_coverage in np.arange(0.0, 0.81, 0.05):
+                r = evaluate(rows, min_score, min_coverage)
+                grid.append((r["paraphrases_answered"] - 2 * r["wrong_answers"], round(min_score, 2),
+                             round(min_coverage, 2), r))
+        for gain, min_score, min_coverage, r in sorted(grid, key=lambda g: -g[0])[:5]:
+            print(f"gain {gain:>3}  min_score={min_score} min_coverage={min_coverage}: {r}")
@@ -0,0 +1,85 @@
+# benchmarks/forest_inference.py
+#
+# Single-row and batch latency of the pickled sklearn forests vs the
+# array-compiled engine in scripts/forest_engine.py.
+#
+#   python -m benchmarks.forest_inference            # synthetic forests
+#   python -m benchmarks.forest_inference --real     # models/*.pkl if present
+#
+# The compiled engine is only timed up to BULK_ROWS; larger batches are
+# sklearn's job (see scripts/scoring_service.py), so only sklearn is shown.
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from scripts.forest_engine import BULK_ROWS, CompiledForest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def synthetic_forests(n_rows=20_000, n_estimators=100, seed=42):
+    """Forests with the same width (15 features) and default depth as the real ones."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 15))
+    y_reg = 5000 + 3000 * X[:, 0] + 1500 * X[:, 4] ** 2 + rng.normal(0, 500, n_rows)
+    y_cls = np.digitize(X[:, 3] + 0.5 * X[:, 2], [-0.5, 0.7])
+
+    rfr = RandomForestRegressor(n_estimators=n_estimators, random_state=seed).fit(X, y_reg)
+    rfc = RandomForestClassifier(n_estimators=n_estimators, random_state=seed).fit(X, y_cls)
+    return {"claim_prediction_rfr": rfr, "risk_classification_rfc": rfc}
+
+def real_forests():
+    forests = {}
+    for name in ("claim_prediction_rfr", "risk_classification_rfc"):
+        path = os.path.join(ROOT, "models", f"{name}.pkl")
+        if os.path.exists(path):
+            forests[name] = joblib.load(path)
+    return forests
+
+def time_call(fn, X, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return np.median(times)
+
+def bench(name, forest, batch_sizes, repeats):
+    compiled = CompiledForest.from_sklearn(forest)
+    is_classifier = compiled.kind == "classifier"
+    sk_fn = forest.predict_proba if is_classifier else forest.predict
+    cf_fn = compiled.predict_proba if is_classifier else compiled.predict
+
+    rng = np.random.default_rng(0)
+    X_big = rng.normal(size=(max(batch_sizes), forest.n_features_in_))
+    X_chk = X_big[:BULK_ROWS]
+    assert np.array_equal(sk_fn(X_chk), cf_fn(X_chk)), f"{name}: outputs differ from sklearn"
+
+    print(f"\n{name}: {compiled.n_estimators} trees, {len(compiled.feature):,} nodes, depth {compiled.max_depth}")
+    print(f"{'rows':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8}")
+    for n in batch_sizes:
+        X = X_big[:n]
+        reps = repeats if n <= 1_000 else max(3, repeats // 10)
+        sk = time_call(sk_fn, X, reps)
+        if n > BULK_ROWS:
+            print(f"{n:>8} {sk * 1e3:>12.3f} {'-':>12} {'':>8}")
+            continue
+        cf = time_call(cf_fn, X, reps)
+        print(f"{n:>8} {sk * 1e3:>12.3f} {cf * 1e3:>12.3f} {sk / cf:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sklearn vs compiled forest latency")
+    parser.add_argument("--real", action="store_true", help="benchmark models/*.pkl instead of synthetic forests")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    forests = real_forests() if args.real else synthetic_forests()
+    if not forests:
+        raise SystemExit("No forests found under models/.")
+    for name, forest in forests.items():
+        bench(name, forest, args.batch_sizes, args.repeats)
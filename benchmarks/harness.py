@@ -0,0 +1,102 @@
+# benchmarks/harness.py
+#
+# Timing, memory and history helpers shared by benchmarks/suite.py.
+
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+ROOT         = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HISTORY_PATH = os.path.join(ROOT, ".cache", "benchmark_history.jsonl")
+
+def measure(fn, repeats=20, warmup=2, items=1):
+    """Latency percentiles, throughput and peak traced memory of ``fn()``.
+
+    ``items`` is how many rows/documents/lines one call processes. Peak
+    memory comes from one extra tracemalloc-traced call, kept out of the
+    timed runs because tracing slows allocation down; it covers Python and
+    NumPy allocations but not torch's own allocator.
+    """
+    for _ in range(warmup):
+        fn()
+
+    times = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeats": repeats,
+        "items": items,
+        "p50_ms": float(np.percentile(times, 50) * 1e3),
+        "p99_ms": float(np.percentile(times, 99) * 1e3),
+        "mean_ms": float(times.mean() * 1e3),
+        "throughput": float(items / np.median(times)),
+        "peak_mb": peak / 2**20,
+    }
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty  = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+def run_metadata():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+# ---------------------- History ----------------------
+# One JSON object per line: {"case": ..., "commit": ..., "p50_ms": ..., ...}
+
+def append_history(records, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def previous_results(history, commit):
+    """Latest result per case recorded at a commit other than ``commit``."""
+    latest = {}
+    for record in history:
+        if record.get("commit") != commit:
+            latest[record["case"]] = record
+    return latest
+
+def format_table(results, baseline=None):
+    baseline = baseline or {}
+    lines = [f"{'case':<44} {'p50 ms':>10} {'p99 ms':>10} {'items/s':>12} {'peak MB':>9} {'vs prev p50':>12}"]
+    for r in results:
+        prev  = baseline.get(r["case"])
+        delta = f"{(r['p50_ms'] / prev['p50_ms'] - 1) * 100:+.1f}%" if prev and prev.get("p50_ms") else ""
+        lines.append(f"{r['case']:<44} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} "
+                     f"{r['throughput']:>12,.1f} {r['peak_mb']:>9.2f} {delta:>12}")
+    return "\n".join(lines)
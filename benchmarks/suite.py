@@ -0,0 +1,272 @@
+# benchmarks/suite.py
+#
+# Offline benchmark suite over the hot path of every scripts module. Models
+# are fitted (tabular) or randomly initialised (transformers) on synthetic
+# data shaped like the real datasets, so no artifacts or network are needed.
+#
+#   python -m benchmarks.suite                      # everything, appended to .cache/benchmark_history.jsonl
+#   python -m benchmarks.suite --only tabular translate --quick
+#   python -m benchmarks.suite --history bench.jsonl --no-record
+#
+# Every run prints p50/p99 latency, throughput and peak traced memory per
+# case, and the p50 change against the latest result for that case recorded
+# at a different commit.
+
+import argparse
+import os
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import (HISTORY_PATH, ROOT, append_history, format_table, load_history,
+                                measure, previous_results, run_metadata)
+from benchmarks.summary_scoring import VOCAB, synthetic_sentences
+
+BATCH_ROWS = 10_000
+
+# ---------------------- Synthetic Tabular Data ----------------------
+# value ranges of the numeric columns in Insurance_RC_CP.csv / Insurance_CS.csv / Insurance_FD.csv
+RANGES = {
+    "Customer_Age": (18, 69), "Annual_Income": (15_000, 155_000), "Property_Age": (0, 19),
+    "Claim_History": (0, 7), "Premium_Amount": (59, 927), "Claim_Amount": (1_000, 35_000),
+    "Claim_to_Income": (0.01, 1.8), "Age_Risk_Factor": (1.0, 1.2),
+    "Age": (18, 74), "Number of Active Policies": (0, 11), "Total Premium Paid": (1_000, 66_000),
+    "Claim Frequency": (0, 7), "Policy Upgrades": (0, 3), "Coverage Amount": (50_000, 1_274_000),
+    "High_Claim": (0, 1),
+}
+INTEGER_COLUMNS = {"Customer_Age", "Property_Age", "Claim_History", "Age", "Number of Active Policies",
+                   "Claim Frequency", "Policy Upgrades", "High_Claim"}
+
+def synthetic_frame(schema, n, seed=0):
+    """Rows with the schema's columns: numerics in their real ranges, categoricals from the known levels."""
+    from scripts.feature_schema import Numeric, OneHot, Ordinal
+
+    rng, data = np.random.default_rng(seed), {}
+    for f in schema.features:
+        if isinstance(f, Numeric):
+            lo, hi = RANGES.get(f.column, (0, 100))
+            values = rng.uniform(lo, hi, n)
+            data[f.column] = values.round() if f.column in INTEGER_COLUMNS else values
+        elif isinstance(f, Ordinal):
+            levels = [k for k in f.mapping if isinstance(k, str) and not k.isdigit()]
+            data[f.column] = rng.choice(levels, n)
+        elif isinstance(f, OneHot):
+            data[f.column] = rng.choice(list(f.categories), n)
+    return pd.DataFrame(data)
+
+def fit_tabular(seed=0, n_train=5_000):
+    """{name: (schema, scaler, model, frame)} for the four tabular models, fitted on synthetic rows."""
+    from sklearn.cluster import KMeans
+    from sklearn.ensemble import IsolationForest, RandomForestClassifier, RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    from scripts.feature_schema import CLAIM, FRAUD, RISK, SEGMENT
+
+    rng, fitted = np.random.default_rng(seed), {}
+    for name, schema in (("risk", RISK), ("claim", CLAIM), ("segment", SEGMENT), ("fraud", FRAUD)):
+        frame  = synthetic_frame(schema, n_train, seed)
+        Xs     = (scaler := StandardScaler()).fit_transform(schema.transform(frame))
+        signal = Xs[:, 0] + 0.5 * Xs[:, min(3, Xs.shape[1] - 1)] + rng.normal(0, 0.3, n_train)
+        if name == "risk":
+            model = RandomForestClassifier(n_estimators=100, random_state=seed).fit(Xs, np.digitize(signal, [-0.5, 0.7]))
+        elif name == "claim":
+            model = RandomForestRegressor(n_estimators=100, random_state=seed).fit(Xs, 5_000 + 2_000 * signal)
+        elif name == "segment":
+            model = KMeans(n_clusters=4, n_init=10, random_state=seed).fit(Xs)
+        else:
+            model = IsolationForest(contamination=0.05, random_state=seed).fit(Xs)
+        fitted[name] = (schema, scaler, model, synthetic_frame(schema, BATCH_ROWS, seed + 1))
+    return fitted
+
+def tabular_cases(quick):
+    from scripts.customer_segmentation import nearest_centroids
+    from scripts.forest_engine import CompiledForest
+
+    repeats, cases = (5 if quick else 50), []
+    for name, (schema, scaler, model, frame) in fit_tabular().items():
+        record = frame.iloc[0].to_dict()
+        cases.append((f"{name}/single_row", lambda s=schema, sc=scaler, m=model, r=record:
+                      m.predict(sc.transform(s.transform(r))), 1, repeats * 4))
+        cases.append((f"{name}/batch_{BATCH_ROWS}", lambda s=schema, sc=scaler, m=model, f=frame:
+                      m.predict(sc.transform(s.transform(f))), BATCH_ROWS, max(3, repeats // 5)))
+        if name in ("risk", "claim"):
+            compiled = CompiledForest.from_sklearn(model)
+            cases.append((f"{name}/single_row_compiled", lambda s=schema, sc=scaler, c=compiled, r=record:
+                          c.predict(sc.transform(s.transform(r))), 1, repeats * 4))
+            cases.append((f"{name}/explain_{BATCH_ROWS}", lambda s=schema, sc=scaler, c=compiled, f=frame:
+                          c.contributions(sc.transform(s.transform(f))), BATCH_ROWS, max(3, repeats // 5)))
+        if name == "segment":
+            cases.append((f"{name}/batch_{BATCH_ROWS}_float32", lambda s=schema, sc=scaler, m=model, f=frame:
+                          nearest_centroids(sc.transform(s.transform(f)), m.cluster_centers_),
+                          BATCH_ROWS, max(3, repeats // 5)))
+    return cases
+
+# ---------------------- Datasets ----------------------
+def dataset_cases(quick):
+    import pyarrow.parquet as pq
+
+    from scripts import datasets
+    from scripts.feature_schema import SEGMENT
+
+    # Insurance_CS.csv / Insurance_CFS.csv are checked in; converted once into .cache/datasets/
+    repeats, cases = (3 if quick else 20), []
+    for dataset in (datasets.CS, datasets.CFS):
+        path = dataset.path()
+        if not os.path.exists(path):
+            continue
+        rows = pq.ParquetFile(datasets.ensure_parquet(path, dataset)).metadata.num_rows
+        cases.append((f"datasets/{dataset.name}_read_csv", lambda p=path: pd.read_csv(p), rows, repeats))
+        cases.append((f"datasets/{dataset.name}_read_parquet", lambda p=path, d=dataset: datasets.read(p, d),
+                      rows, repeats))
+        if dataset is datasets.CS:
+            cases.append(("datasets/customers_chunks_projected", lambda p=path: [
+                len(c) for c in datasets.iter_chunks(p, datasets.CS, columns=SEGMENT.columns)], rows, repeats))
+    return cases
+
+# ---------------------- Text ----------------------
+def summary_cases(quick):
+    import spacy
+
+    from scripts.summarizer import summarize_doc
+
+    try:
+        nlp, label = spacy.load("en_core_web_sm"), "en_core_web_sm"
+    except OSError:
+        # same Doc.sents interface; keeps the suite runnable without the model package
+        nlp, label = spacy.blank("en"), "sentencizer"
+        nlp.add_pipe("sentencizer")
+    nlp.max_length = 10_000_000
+
+    cases = []
+    for n in ((100, 1_000) if quick else (100, 1_000, 5_000)):
+        text = " ".join(s.capitalize() + "." for s in synthetic_sentences(n))
+        # summarize_doc(nlp(text)) is spacy_extractive_summary minus its cached model loader
+        cases.append((f"summary/{n}_sentences[{label}]", lambda t=text: summarize_doc(nlp(t), 7),
+                      n, 2 if n >= 5_000 else (3 if quick else 10)))
+    return cases
+
+def extraction_cases(quick):
+    from scripts.text_extraction import extract_text
+
+    pdf = os.path.join(ROOT, "Dataset", "Aspire_Policy_Wordings.pdf")
+    if not os.path.exists(pdf):
+        return []
+    extract_text(pdf)   # populate the content-hash cache for the cached case
+    return [
+        ("extraction/aspire_pdf_cold", lambda: extract_text(pdf, use_cache=False, workers=1), 1, 1 if quick else 3),
+        ("extraction/aspire_pdf_cached", lambda: extract_text(pdf), 1, 20),
+    ]
+
+def translate_cases(quick):
+    from scripts.multilingual_translator import EchoBackend, translate_text
+
+    n    = 500 if quick else 2_000
+    text = "\n".join(synthetic_sentences(n, seed=1))
+    return [
+        (f"translate_text/{n}_lines_stub", lambda: translate_text(text, "en", "hi", backend=EchoBackend("en", "hi")),
+         n, 3 if quick else 10),
+        (f"translate_text/{n}_lines_stub_20ms", lambda: translate_text(text, "en", "hi",
+                                                                      backend=EchoBackend("en", "hi", latency=0.02)),
+         n, 2 if quick else 5),
+    ]
+
+# ---------------------- Transformers ----------------------
+def tiny_tokenizer():
+    """Word-level fast tokenizer over the benchmark vocabulary; no downloads needed."""
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers
+    from tokenizers.processors import TemplateProcessing
+    from transformers import PreTrainedTokenizerFast
+
+    words = sorted(set(VOCAB) | set(re.findall(r"\w+", "answer the following insurance related question "
+                                                       "accurately and politely unfriendly staff long hold times")))
+    vocab = {"[PAD]": 0, "[UNK]": 1, "[CLS]": 2, "[SEP]": 3, **{w: i + 4 for i, w in enumerate(words)}}
+    tok = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tok.normalizer     = normalizers.Lowercase()
+    tok.pre_tokenizer  = pre_tokenizers.BertPreTokenizer()
+    tok.post_processor = TemplateProcessing(single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)])
+    return PreTrainedTokenizerFast(tokenizer_object=tok, pad_token="[PAD]", unk_token="[UNK]", cls_token="[CLS]",
+                                   sep_token="[SEP]", eos_token="[SEP]", model_max_length=128)
+
+class GeneratePipeline:
+    """Minimal text2text-generation pipeline for transformers versions that dropped the task."""
+
+    def __init__(self, model, tokenizer):
+        self.model, self.tokenizer = model, tokenizer
+
+    def __call__(self, prompts, batch_size=None, **kwargs):
+        batch = [prompts] if isinstance(prompts, str) else prompts
+        enc   = self.tokenizer(batch, return_tensors="pt", padding=True)
+        out   = self.model.generate(**enc, **kwargs)
+        return [{"generated_text": t} for t in self.tokenizer.batch_decode(out, skip_special_tokens=True)]
+
+def transformer_cases(quick):
+    import torch
+    from transformers import (BertConfig, BertForSequenceClassification, T5Config, T5ForConditionalGeneration,
+                              pipeline)
+
+    from scripts.batch_sentiment import score_texts
+    from scripts.insurance_chatbot import generate_insurance_response
+
+    torch.manual_seed(0)
+    tokenizer = tiny_tokenizer()
+    bert = BertForSequenceClassification(BertConfig(
+        vocab_size=len(tokenizer), hidden_size=64, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=128, num_labels=3, max_position_embeddings=128)).eval()
+    t5 = T5ForConditionalGeneration(T5Config(
+        vocab_size=len(tokenizer), d_model=64, d_kv=16, d_ff=128, num_layers=2, num_heads=4,
+        decoder_start_token_id=0, pad_token_id=0, eos_token_id=3)).eval()
+
+    sentiment = pipeline("sentiment-analysis", model=bert, tokenizer=tokenizer)
+    try:
+        generator = pipeline("text2text-generation", model=t5, tokenizer=tokenizer)
+    except KeyError:
+        generator = GeneratePipeline(t5, tokenizer)
+
+    reviews = synthetic_sentences(1_000 if quick else 5_000, seed=2)
+    return [
+        ("sentiment/pipeline_single_tiny_bert", lambda: sentiment(reviews[0]), 1, 20 if quick else 100),
+        (f"sentiment/batch_{len(reviews)}_tiny_bert", lambda: score_texts(reviews, tokenizer, bert, 64),
+         len(reviews), 3 if quick else 5),
+        ("chatbot/generate_tiny_t5", lambda: generate_insurance_response(generator, "How do I file a claim?"),
+         1, 5 if quick else 20),
+    ]
+
+GROUPS = {
+    "tabular": tabular_cases,
+    "datasets": dataset_cases,
+    "summary": summary_cases,
+    "extraction": extraction_cases,
+    "translate": translate_cases,
+    "transformers": transformer_cases,
+}
+
+def run(groups, quick=False):
+    results, meta = [], run_metadata()
+    for group in groups:
+        for case, fn, items, repeats in GROUPS[group](quick):
+            print(f"  {case} ...", flush=True)
+            results.append({"case": case, "group": group, **meta, **measure(fn, repeats, items=items)})
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the scripts modules")
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), help="run only these groups")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller inputs")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON-lines history file")
+    parser.add_argument("--no-record", action="store_true", help="don't append this run to the history")
+    args = parser.parse_args()
+
+    # st.cache_* decorators warn about the missing Streamlit runtime on every call
+    warnings.filterwarnings("ignore")
+    import logging
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    results  = run(args.only or list(GROUPS), args.quick)
+    baseline = previous_results(load_history(args.history), results[0]["commit"] if results else None)
+    print()
+    print(format_table(results, baseline))
+    if not args.no_record:
+        append_history(results, args.history)
+        print(f"\nAppended {len(results)} results to {args.history}")
@@ -0,0 +1,69 @@
+# benchmarks/summary_scoring.py
+#
+# Sentence scoring in the policy summarizer: dense cosine_similarity row sums
+# vs the linear sparse scoring in scripts/summarizer.py, across document sizes.
+#
+#   python -m benchmarks.summary_scoring
+#   python -m benchmarks.summary_scoring --sizes 1000 10000 100000 --dense-limit 10000
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from scripts.summarizer import score_sentences, select_sentences
+
+VOCAB = (
+    "policy insured insurer claim premium cover benefit hospital treatment expenses sum "
+    "waiting period exclusion deductible renewal nominee accident illness surgery room rent "
+    "ambulance maternity pre existing disease co payment network cashless reimbursement "
+    "grace notice cancellation portability endorsement schedule certificate limit floater"
+).split()
+
+def synthetic_sentences(n, seed=0):
+    rng     = np.random.default_rng(seed)
+    lengths = rng.integers(8, 30, size=n)
+    # Zipf-like word frequencies, like real policy text
+    weights = 1.0 / np.arange(1, len(VOCAB) + 1)
+    weights /= weights.sum()
+    return [" ".join(rng.choice(VOCAB, size=k, p=weights)) for k in lengths]
+
+def dense_scores(X):
+    return cosine_similarity(X).sum(axis=1)
+
+def time_call(fn, X, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return np.median(times)
+
+def bench(sizes, dense_limit, repeats, k=7):
+    print(f"{'sentences':>10} {'dense ms':>12} {'dense MB':>10} {'linear ms':>11} {'speedup':>8}")
+    for n in sizes:
+        X = TfidfVectorizer(stop_words="english").fit_transform(synthetic_sentences(n))
+        linear = score_sentences(X)
+        lin_t  = time_call(score_sentences, X, repeats)
+
+        if n > dense_limit:
+            print(f"{n:>10} {'-':>12} {n * n * 8 / 1e6:>10.0f} {lin_t * 1e3:>11.3f} {'-':>8}")
+            continue
+        dense = dense_scores(X)
+        assert np.allclose(dense, linear), f"{n}: scores differ"
+        # near-equal scores may swap places, so compare the selected scores rather than indices
+        assert np.allclose(dense[select_sentences(dense, k)].sum(), linear[select_sentences(linear, k)].sum()), \
+            f"{n}: selections differ"
+        dense_t = time_call(dense_scores, X, max(1, repeats // 5))
+        print(f"{n:>10} {dense_t * 1e3:>12.3f} {n * n * 8 / 1e6:>10.0f} {lin_t * 1e3:>11.3f} {dense_t / lin_t:>7.0f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dense vs linear summary sentence scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 5_000, 10_000, 50_000])
+    parser.add_argument("--dense-limit", type=int, default=10_000,
+                        help="skip the dense n x n scoring above this many sentences")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    bench(args.sizes, args.dense_limit, args.repeats)
@@ -0,0 +1,135 @@
+# scripts/batch_sentiment.py
+#
+# Label a reviews CSV with the sentiment model in length-bucketed batches.
+#
+#   python -m scripts.batch_sentiment Dataset/Insurance_CFS.csv -o Dataset/Insurance_CFS_scored.csv
+#   python -m scripts.batch_sentiment new_reviews.csv -o scored.csv --resume     # daily increments
+#
+# Reviews are read in chunks; within a chunk they are sorted by token length
+# and cut into batches, so each batch pads to its own longest review instead
+# of the chunk's. Each distinct review text in a chunk is scored once. Scored
+# chunks are appended to the output as they finish, and rows that carry a
+# Sentiment_Label are used for a running accuracy.
+
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+from scripts import datasets
+
+log = logging.getLogger("batch_sentiment")
+
+TEXT_COL   = "Review_Text"
+LABEL_COL  = "Sentiment_Label"
+CHUNK_ROWS = 8_192
+BATCH_SIZE = 64
+MAX_LENGTH = 128
+
+# ---------------------- Model ----------------------
+def load_model(model_path=None):
+    """(tokenizer, model, label names) from a path, or the app's own sentiment pipeline."""
+    if model_path:
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        model     = AutoModelForSequenceClassification.from_pretrained(model_path)
+    else:
+        from scripts.sentiment_predictor import load_sentiment_model
+        pipe = load_sentiment_model()
+        tokenizer, model = pipe.tokenizer, pipe.model
+    model.eval()
+    return tokenizer, model, label_names(model.config.id2label)
+
+def label_names(id2label):
+    # the fine-tuned cardiff model reports LABEL_0..2; same mapping as sentiment_predictor.map_label
+    from scripts.sentiment_predictor import map_label
+    return [
+        map_label(id2label[i]) if str(id2label[i]).startswith("LABEL_") else str(id2label[i]).lower()
+        for i in range(len(id2label))
+    ]
+
+# ---------------------- Scoring ----------------------
+def score_texts(texts, tokenizer, model, batch_size=BATCH_SIZE, max_length=MAX_LENGTH):
+    """(class index, confidence) arrays for ``texts``, batched by token length."""
+    encoded = tokenizer(list(texts), truncation=True, max_length=max_length)["input_ids"]
+    order   = np.argsort([len(ids) for ids in encoded], kind="stable")
+    preds   = np.empty(len(encoded), dtype=np.int64)
+    conf    = np.empty(len(encoded), dtype=np.float32)
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx   = order[start:start + batch_size]
+            batch = tokenizer.pad({"input_ids": [encoded[i] for i in idx]}, return_tensors="pt")
+            probs = torch.softmax(model(**batch).logits, dim=-1)
+            best  = probs.max(dim=-1)
+            preds[idx] = best.indices.numpy()
+            conf[idx]  = best.values.numpy()
+    return preds, conf
+
+def score_csv(source, output, tokenizer, model, labels, batch_size=BATCH_SIZE, chunk_rows=CHUNK_ROWS,
+              resume=False):
+    """Score ``source`` into ``output`` chunk by chunk; returns the summary counters.
+
+    With ``resume`` the rows already present in ``output`` are skipped, so a
+    file that only grew since the last run costs only its new rows.
+    """
+    done = 0
+    if resume and os.path.exists(output) and os.path.getsize(output):
+        # count parsed rows, not lines: reviews may contain quoted newlines
+        done = len(pd.read_csv(output, usecols=[0]))
+    mode = "a" if done else "w"
+
+    total = correct = labelled = 0
+    start = time.perf_counter()
+    reader = datasets.iter_chunks(source, datasets.CFS, chunk_rows, skip_rows=done)
+    with open(output, mode, newline="", encoding="utf-8") as out:
+        for i, chunk in enumerate(reader):
+            # reviews repeat (Review_Text is categorical); score each distinct text once
+            codes, texts = pd.factorize(chunk[TEXT_COL], use_na_sentinel=False)
+            texts = pd.Series(texts, dtype=object).fillna("").astype(str)
+            preds, conf = score_texts(texts, tokenizer, model, batch_size)
+            chunk = chunk.assign(Predicted_Sentiment=np.asarray(labels, dtype=object)[preds[codes]],
+                                 Sentiment_Confidence=conf[codes].round(4))
+            chunk.to_csv(out, header=(mode == "w" and i == 0), index=False)
+            out.flush()
+
+            total += len(chunk)
+            if LABEL_COL in chunk.columns:
+                known     = chunk[LABEL_COL].notna()
+                labelled += int(known.sum())
+                correct  += int((chunk.loc[known, LABEL_COL].str.lower() == chunk.loc[known, "Predicted_Sentiment"]).sum())
+            elapsed = time.perf_counter() - start
+            log.info("%d reviews, %.0f reviews/s, accuracy %s", done + total, total / elapsed,
+                     f"{correct / labelled:.2%}" if labelled else "n/a")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "skipped": done,
+        "scored": total,
+        "seconds": round(elapsed, 2),
+        "reviews_per_sec": round(total / elapsed, 1) if elapsed else None,
+        "accuracy": correct / labelled if labelled else None,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch sentiment scoring of a reviews CSV")
+    parser.add_argument("source")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--model", help="saved sequence-classification model (default: the app's sentiment model)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="reviews sorted by length together")
+    parser.add_argument("--resume", action="store_true", help="skip rows already in the output file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    tokenizer, model, labels = load_model(args.model)
+    summary = score_csv(args.source, args.output, tokenizer, model, labels,
+                        args.batch_size, args.chunk_rows, args.resume)
+    log.info("Done: %s", summary)
+
+if __name__ == "__main__":
+    main()
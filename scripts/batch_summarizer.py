@@ -0,0 +1,134 @@
+# scripts/batch_summarizer.py
+#
+# Summarize a whole folder or ZIP of policy documents.
+#
+#   python -m scripts.batch_summarizer Dataset/ -o summaries/
+#   python -m scripts.batch_summarizer policy_library.zip -o summaries/ --processes 4 --format txt
+#
+# Documents stream through nlp.pipe on a spaCy pipeline trimmed to sentence
+# segmentation (senter, or a rule-based sentencizer if the model has none),
+# and each summary is written as soon as its document is done, so an
+# interrupted overnight run keeps everything finished so far.
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import spacy
+
+from scripts.summarizer import save_summary_to_docx, summarize_doc
+from scripts.text_extraction import extract_text
+
+log = logging.getLogger("batch_summarizer")
+
+SUPPORTED = (".pdf", ".docx")
+# everything in en_core_web_sm except what sentence boundaries need
+SENTENCE_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+MAX_LENGTH = 10_000_000
+
+# ---------------------- Pipeline ----------------------
+def load_sentence_model(name="en_core_web_sm"):
+    """The smallest pipeline that still sets sentence boundaries."""
+    try:
+        nlp = spacy.load(name, exclude=SENTENCE_EXCLUDE)
+        nlp.enable_pipe("senter")
+    except (OSError, ValueError, KeyError) as e:
+        log.warning("No senter in %s (%s); falling back to the rule-based sentencizer", name, e)
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+    # without the parser and NER, long policy wordings no longer risk memory blow-ups
+    nlp.max_length = MAX_LENGTH
+    return nlp
+
+# ---------------------- Inputs ----------------------
+def find_documents(folder):
+    for root, _, files in os.walk(folder):
+        for fname in sorted(files):
+            if fname.lower().endswith(SUPPORTED):
+                yield os.path.join(root, fname)
+
+def unpack_zip(zip_path, target_dir):
+    with zipfile.ZipFile(zip_path) as zf:
+        members = [m for m in zf.namelist() if m.lower().endswith(SUPPORTED) and not m.startswith("__MACOSX/")]
+        for member in members:
+            zf.extract(member, target_dir)
+    return [os.path.join(target_dir, m) for m in members]
+
+def read_documents(paths, root):
+    """(text, relative_name) pairs; unreadable files are logged and skipped."""
+    for path in paths:
+        name = os.path.relpath(path, root)
+        try:
+            text = extract_text(path)
+        except Exception as e:
+            log.warning("Skipping %s: %s", name, e)
+            continue
+        if text.strip():
+            yield text, name
+        else:
+            log.warning("Skipping %s: no extractable text", name)
+
+# ---------------------- Batch ----------------------
+def output_path(output_dir, name, fmt):
+    # the source extension stays in the name, so a.pdf and a.docx don't share a_summary.docx
+    return os.path.join(output_dir, f"{name}_summary.{fmt}")
+
+def summarize_batch(paths, root, output_dir, num_sentences=7, fmt="docx", n_process=1, batch_size=4,
+                    skip_existing=True, nlp=None):
+    """Summarize documents through one nlp.pipe call, writing each summary as it completes.
+
+    Returns ``(written, skipped)``: summaries written, and documents skipped
+    because their summary already existed. With ``skip_existing`` an
+    interrupted run can simply be restarted.
+    """
+    nlp   = nlp or load_sentence_model()
+    total = len(paths)
+    if skip_existing:
+        paths = [p for p in paths if not os.path.exists(output_path(output_dir, os.path.relpath(p, root), fmt))]
+
+    written, start = 0, time.perf_counter()
+    docs = read_documents(paths, root)
+    for doc, name in nlp.pipe(docs, as_tuples=True, n_process=n_process, batch_size=batch_size):
+        summary = summarize_doc(doc, num_sentences)
+        out     = output_path(output_dir, name, fmt)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        if fmt == "docx":
+            save_summary_to_docx(summary, out)
+        else:
+            with open(out, "w", encoding="utf-8") as f:
+                f.write(summary)
+        written += 1
+        log.info("[%d/%d] %s -> %s (%.1fs elapsed)", written, len(paths), name, out, time.perf_counter() - start)
+    return written, total - len(paths)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a folder or ZIP of PDF/DOCX policy documents")
+    parser.add_argument("source", help="folder or .zip of documents")
+    parser.add_argument("-o", "--output", default="summaries")
+    parser.add_argument("-n", "--num-sentences", type=int, default=7)
+    parser.add_argument("--format", choices=["docx", "txt"], default="docx")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 1) - 1))
+    parser.add_argument("--batch-size", type=int, default=4, help="documents per nlp.pipe batch")
+    parser.add_argument("--overwrite", action="store_true", help="re-summarize documents that already have output")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    with tempfile.TemporaryDirectory() as tmp:
+        if zipfile.is_zipfile(args.source):
+            root, paths = tmp, unpack_zip(args.source, tmp)
+        elif os.path.isdir(args.source):
+            root, paths = args.source, list(find_documents(args.source))
+        else:
+            sys.exit(f"{args.source} is neither a folder nor a ZIP file")
+
+        written, skipped = summarize_batch(paths, root, args.output, args.num_sentences, args.format,
+                                           args.processes, args.batch_size, skip_existing=not args.overwrite)
+    failed = len(paths) - skipped - written
+    log.info("Wrote %d summaries to %s; %d already summarized, %d unreadable", written, args.output, skipped, failed)
+
+if __name__ == "__main__":
+    main()
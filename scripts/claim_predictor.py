@@ -1,23 +1,96 @@
 # scripts/claim_predictor.py
 
-import os
-import joblib
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import streamlit as st
 
-@st.cache_resource
+from scripts import model_registry
+from scripts.feature_schema import CLAIM as SCHEMA
+from scripts.instrumentation import span
+
 def load_artifacts():
-    # Compute project root (parent of scripts/)
-    BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    # Pickles in models/
-    model_path  = os.path.join(BASE, "models", "claim_prediction_rfr.pkl")
-    scaler_path = os.path.join(BASE, "models", "scaler_cp.pkl")
-    # Load artifacts
-    model  = joblib.load(model_path)
-    scaler = joblib.load(scaler_path)
+    # current version from models/manifest.json (see scripts/model_registry.py)
+    model  = model_registry.load(SCHEMA, "model")
+    scaler = model_registry.load(SCHEMA, "scaler")
+    SCHEMA.check(scaler, model)
     return model, scaler
 
+def load_fast_model():
+    # Array-compiled copy of the forest for single-row latency; maps
+    # models/<model>.forest when present (see scripts/forest_engine.py)
+    return model_registry.load_fast(SCHEMA)
+
+# ---------------------- What-if Sweeps ----------------------
+# numeric features that can be varied: default (from, to, points) and whether values are whole numbers
+SWEEP_RANGES = {
+    "Premium_Amount":  (1_000.0, 100_000.0, 100, False),
+    "Customer_Age":    (18, 100, 83, True),
+    "Claim_History":   (0, 20, 21, True),
+    "Annual_Income":   (100_000.0, 2_000_000.0, 100, False),
+    "Property_Age":    (0, 50, 51, True),
+    "Claim_to_Income": (0.0, 1.0, 100, False),
+    "Age_Risk_Factor": (0.0, 5.0, 100, False),
+}
+MAX_SWEEP_POINTS = 1_000
+MAX_GRID_POINTS  = 250_000
+
+def sweep_grid(model, scaler, record, axes):
+    """Predicted claim over every combination of ``axes`` ({feature: values}).
+
+    All other features stay at ``record``. The base row is encoded once and
+    repeated, the swept columns are overwritten, and the whole grid goes
+    through one ``scaler.transform`` and one ``model.predict``. Returns an
+    array of shape ``tuple(len(values) for values in axes.values())``.
+    """
+    names  = SCHEMA.feature_names
+    mesh   = np.meshgrid(*[np.asarray(v, dtype=np.float64) for v in axes.values()], indexing="ij")
+    X      = np.repeat(SCHEMA.transform(record), mesh[0].size, axis=0)
+    for feature, values in zip(axes, mesh):
+        X[:, names.index(feature)] = values.ravel()
+    return model.predict(scaler.transform(X)).reshape(mesh[0].shape)
+
+def sweep_axis(feature, start, stop, points):
+    values = np.linspace(start, stop, int(points))
+    return np.unique(np.round(values)) if SWEEP_RANGES[feature][3] else values
+
+def plot_sweep(axes, grid):
+    (x_name, x), *rest = axes.items()
+    if not rest:
+        st.line_chart(pd.DataFrame({"Predicted Claim Amount": grid}, index=pd.Index(x, name=x_name)))
+        return
+    (y_name, y), = rest
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    mesh = ax.pcolormesh(y, x, grid, shading="auto", cmap="viridis")
+    fig.colorbar(mesh, ax=ax, label="Predicted Claim Amount (₹)")
+    ax.set_xlabel(y_name)
+    ax.set_ylabel(x_name)
+    st.pyplot(fig)
+    plt.close(fig)
+
+def run_sweep(model, scaler, record):
+    st.markdown("Vary one or two features over a range, holding the inputs above fixed.")
+    features = st.multiselect("Features to vary", list(SWEEP_RANGES), default=["Premium_Amount"], max_selections=2)
+
+    axes = {}
+    for feature in features:
+        start, stop, points, _ = SWEEP_RANGES[feature]
+        col1, col2, col3 = st.columns(3)
+        start  = col1.number_input(f"{feature} from", value=start, key=f"sweep_{feature}_from")
+        stop   = col2.number_input(f"{feature} to", value=stop, key=f"sweep_{feature}_to")
+        points = col3.number_input(f"{feature} points", 2, MAX_SWEEP_POINTS, points, key=f"sweep_{feature}_points")
+        axes[feature] = sweep_axis(feature, start, stop, points)
+
+    size = int(np.prod([len(v) for v in axes.values()])) if axes else 0
+    if size > MAX_GRID_POINTS:
+        st.warning(f"⚠️ {size:,} grid points; reduce the points to at most {MAX_GRID_POINTS:,} in total.")
+    elif st.button("Run Sweep", disabled=not axes):
+        with span("claim_predictor.sweep"):
+            grid = sweep_grid(model, scaler, record, axes)
+        st.caption(f"{grid.size:,} predictions in one batch · range ₹{grid.min():,.0f} – ₹{grid.max():,.0f}")
+        with span("claim_predictor.render"):
+            plot_sweep(axes, grid)
+
 def run():
     st.header("💰 Claim Amount Prediction")
 
@@ -40,48 +113,41 @@ def run():
     gender            = st.selectbox("Gender", ["Male","Female"])
     policy_type       = st.selectbox("Policy Type", ["Auto","Health","Life","Property"])
 
-    # ——— Encode ———
-    risk_map   = {"Low":0, "Medium":1, "High":2}
-    fraud_map  = {"No":0, "Yes":1}
-
-    rs = risk_map[risk_score]
-    fc = fraud_map[fraudulent]
-
-    # one-hot for gender: [Female, Male]
-    gender_ohe = [1 if gender=="Female" else 0,
-                  1 if gender=="Male"   else 0]
-
-    # one-hot for policy: [Auto, Health, Life, Property]
-    policies   = ["Auto","Health","Life","Property"]
-    policy_ohe = [1 if policy_type==p else 0 for p in policies]
-
-    # ——— Assemble exactly 15 features ———
-    X = np.array([[
-        age,
-        annual_income,
-        property_age,
-        claim_history,
-        rs,
-        premium_amount,
-        fc,
-        claim_to_income,
-        age_risk_factor
-    ] + gender_ohe + policy_ohe], dtype=float)
+    record = {
+        "Customer_Age":     age,
+        "Annual_Income":    annual_income,
+        "Property_Age":     property_age,
+        "Claim_History":    claim_history,
+        "Risk_Score":       risk_score,
+        "Premium_Amount":   premium_amount,
+        "Fraudulent_Claim": fraudulent,
+        "Claim_to_Income":  claim_to_income,
+        "Age_Risk_Factor":  age_risk_factor,
+        "Gender":           gender,
+        "Policy_Type":      policy_type,
+    }
+
+    # ——— Encode exactly 15 features (see feature_schema.CLAIM) ———
+    with span("claim_predictor.features"):
+        X = SCHEMA.transform(record)
+
+    single_tab, sweep_tab = st.tabs(["Single Prediction", "What-if Sweep"])
+    with sweep_tab:
+        # whole grids score faster through sklearn than through the compiled forest
+        run_sweep(model, scaler, record)
 
     # ——— Predict & display ———
-    if st.button("Predict Claim Amount"):
-        Xs   = scaler.transform(X)
-        pred = model.predict(Xs)[0]
-        st.success(f"🔮 Predicted Claim Amount: ₹{pred:,.2f}")
-
-        # Optionally show the feature values
-        df = pd.DataFrame({
-            "Feature": [
-                "age","annual_income","property_age","claim_history","risk_score",
-                "premium_amount","fraudulent_claim","claim_to_income","age_risk_factor",
-                "gender_Female","gender_Male",
-                "policy_Auto","policy_Health","policy_Life","policy_Property"
-            ],
-            "Value": X.flatten().tolist()
-        })
-        st.table(df)
+    with single_tab:
+        if st.button("Predict Claim Amount"):
+            model = load_fast_model()
+            with span("claim_predictor.predict"):
+                Xs   = scaler.transform(X)
+                pred = model.predict(Xs)[0]
+            st.success(f"🔮 Predicted Claim Amount: ₹{pred:,.2f}")
+
+            # Optionally show the feature values
+            df = pd.DataFrame({
+                "Feature": SCHEMA.feature_names,
+                "Value": X.flatten().tolist()
+            })
+            st.table(df)
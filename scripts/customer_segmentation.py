@@ -1,24 +1,164 @@
 # scripts/customer_segmentation.py
 
+import copy
+import io
 import os
+import tempfile
 import joblib
 import numpy as np
 import streamlit as st
 
-@st.cache_resource
+from scripts import datasets, model_registry
+from scripts.feature_schema import SEGMENT as SCHEMA
+from scripts.instrumentation import span
+
+CLUSTER_LABELS = {
+    0: "Young Professionals",
+    1: "High-Value Clients",
+    2: "Frequent Claimers",
+    3: "Passive Buyers",
+    4: "Engaged Mid-Income"
+}
+
+SEGMENT_CHUNK_SIZE = 50_000
+
 def load_artifacts():
-    BASE        = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    scaler_path = os.path.join(BASE, "models", "scaler_cs.pkl")
-    kmeans_path = os.path.join(BASE, "models", "customer_segmentation_kmeans.pkl")
-    scaler      = joblib.load(scaler_path)
-    kmeans      = joblib.load(kmeans_path)
+    # current version from models/manifest.json (see scripts/model_registry.py)
+    scaler = model_registry.load(SCHEMA, "scaler")
+    kmeans = model_registry.load(SCHEMA, "model")
+    SCHEMA.check(scaler, kmeans)
     return scaler, kmeans
 
+# ---------------------- Bulk Segmentation ----------------------
+def nearest_centroids(Xs, centers):
+    """float32 nearest-centroid labels and (n, k) Euclidean distances for one chunk.
+
+    Uses ||x||² - 2·x·c + ||c||² so the only large temporary is the (n, k)
+    distance block itself, at half the size of kmeans.transform's float64 one.
+    """
+    X  = np.asarray(Xs, dtype=np.float32)
+    C  = np.asarray(centers, dtype=np.float32)
+    d2 = (X * X).sum(axis=1, keepdims=True) - 2.0 * (X @ C.T) + (C * C).sum(axis=1)
+    np.maximum(d2, 0.0, out=d2)
+    labels = d2.argmin(axis=1)
+    return labels, np.sqrt(d2, out=d2)
+
+def segment_chunks(source, scaler, kmeans, chunksize=SEGMENT_CHUNK_SIZE):
+    """Yield ``Insurance_CS.csv``-shaped chunks labelled with cluster, segment and distances."""
+    names = [CLUSTER_LABELS.get(i, f"Cluster {i}") for i in range(len(kmeans.cluster_centers_))]
+    for chunk in datasets.iter_chunks(source, datasets.CS, chunksize):
+        with span("customer_segmentation.batch_predict"):
+            labels, dists = nearest_centroids(scaler.transform(SCHEMA.transform(chunk)), kmeans.cluster_centers_)
+        chunk["Cluster"] = labels
+        chunk["Segment"] = np.asarray(names, dtype=object)[labels]
+        chunk["Distance_to_Centroid"] = dists[np.arange(len(labels)), labels]
+        for i, name in enumerate(names):
+            chunk[f"Dist_{name}"] = dists[:, i]
+        yield chunk
+
+def refit_incremental(kmeans, scaler, source, chunksize=SEGMENT_CHUNK_SIZE, batch_size=1024, prior_counts=None):
+    """Absorb new customers into the saved centroids with mini-batch updates.
+
+    Applies MiniBatchKMeans's per-batch centre update, seeded with the saved
+    centroids and with per-cluster counts from the original fit
+    (``kmeans.labels_``). A month of new customers therefore nudges the
+    centroids in proportion to its size instead of re-clustering everyone.
+    Returns an updated copy of ``kmeans`` and the number of rows absorbed.
+    """
+    centers = np.asarray(kmeans.cluster_centers_, dtype=np.float64).copy()
+    if prior_counts is None:
+        prior_counts = np.bincount(kmeans.labels_, minlength=len(centers)) if hasattr(kmeans, "labels_") else np.ones(len(centers))
+    counts = np.asarray(prior_counts, dtype=np.float64).copy()
+
+    rows = 0
+    for chunk in datasets.iter_chunks(source, datasets.CS, chunksize, columns=SCHEMA.columns):
+        Xs = scaler.transform(SCHEMA.transform(chunk))
+        for start in range(0, len(Xs), batch_size):
+            batch     = Xs[start:start + batch_size]
+            labels, _ = nearest_centroids(batch, centers)
+            n_new     = np.bincount(labels, minlength=len(centers)).astype(np.float64)
+            sums      = np.zeros_like(centers)
+            np.add.at(sums, labels, batch)
+            hit = n_new > 0
+            counts[hit]  += n_new[hit]
+            centers[hit] += (sums[hit] - n_new[hit, None] * centers[hit]) / counts[hit, None]
+        rows += len(Xs)
+
+    updated = copy.deepcopy(kmeans)
+    updated.cluster_centers_ = centers
+    updated.center_counts_   = counts
+    if hasattr(updated, "labels_"):
+        del updated.labels_  # labels of the original training rows no longer apply
+    return updated, rows
+
+def run_bulk(scaler, kmeans):
+    st.markdown("Assign every customer in an `Insurance_CS.csv`-shaped file to a segment.")
+
+    uploaded_file = st.file_uploader("📂 Upload customers CSV", type=["csv"], key="bulk_upload")
+    file_path     = st.text_input("…or a CSV path on the server", "", key="bulk_path")
+
+    source = uploaded_file if uploaded_file is not None else file_path.strip()
+    if st.button("Segment Customers"):
+        if not source:
+            st.warning("⚠️ Please upload a CSV or enter a file path.")
+            return
+        if isinstance(source, str) and not os.path.exists(source):
+            st.error(f"❌ File not found: {source}")
+            return
+        # streamed to disk chunk by chunk, like risk_classifier.run_batch
+        fd, output_path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        with st.spinner("🔄 Segmenting in chunks..."):
+            rows = datasets.write_scored(segment_chunks(source, scaler, kmeans), output_path)
+        st.success(f"✅ Segmented {rows:,} customers.")
+        with open(output_path, "rb") as f:
+            st.download_button(
+                label="📥 Download Segments",
+                data=f,
+                file_name="customer_segments.csv",
+                mime="text/csv",
+            )
+        os.remove(output_path)
+
+def run_refit(scaler, kmeans):
+    st.markdown("Absorb a batch of new customers into the saved centroids without a full retrain.")
+
+    uploaded_file = st.file_uploader("📂 Upload new customers CSV", type=["csv"], key="refit_upload")
+    if uploaded_file is not None and st.button("Update Centroids"):
+        with st.spinner("🔄 Applying mini-batch updates..."):
+            updated, rows = refit_incremental(kmeans, scaler, uploaded_file)
+
+        shift = np.linalg.norm(updated.cluster_centers_ - kmeans.cluster_centers_, axis=1)
+        st.success(f"✅ Absorbed {rows:,} customers.")
+        st.table({
+            "Segment": [CLUSTER_LABELS.get(i, f"Cluster {i}") for i in range(len(shift))],
+            "Centroid Shift": np.round(shift, 4),
+            "Customers Seen": updated.center_counts_.astype(int),
+        })
+
+        buf = io.BytesIO()
+        joblib.dump(updated, buf)
+        st.download_button(
+            label="📥 Download Updated Model",
+            data=buf.getvalue(),
+            file_name=SCHEMA.model_file,
+            mime="application/octet-stream",
+        )
+
 def run():
     st.header("👥 Customer Segmentation")
 
     scaler, kmeans = load_artifacts()
 
+    single_tab, bulk_tab, refit_tab = st.tabs(["Single Customer", "Bulk Segmentation", "Incremental Refit"])
+    with single_tab:
+        run_single(scaler, kmeans)
+    with bulk_tab:
+        run_bulk(scaler, kmeans)
+    with refit_tab:
+        run_refit(scaler, kmeans)
+
+def run_single(scaler, kmeans):
     # ——— Inputs ———
     age                 = st.number_input("Age", 18, 100, 35)
     gender              = st.selectbox("Gender", ["Male","Female"])
@@ -28,59 +168,38 @@ def run():
     total_premium_paid  = st.number_input("Total Premium Paid", 0.0, 1e7, 20000.0, step=100.0)
     claim_frequency     = st.number_input("Claim Frequency", 0, 50, 1)
     policy_upgrades     = st.number_input("Policy Upgrades", 0, 10, 0)
-    occupation          = st.selectbox("Occupation", ["Salaried","Self-Employed","Retired","Student","Unemployed"])
+    occupation          = st.selectbox("Occupation", ["Salaried","Self-Employed","Retired","Business Owner","Student"])
     coverage_amount     = st.number_input("Coverage Amount", 0.0, 1e7, 100000.0, step=1000.0)
     policy_type         = st.selectbox("Policy Type", ["Auto","Health","Life","Property"])
 
     # ——— Label-encode every categorical exactly as used in training ———
-    gender_map  = {"Male":0, "Female":1}
-    loc_map     = {"Urban":0, "Suburban":1, "Rural":2}
-    inc_map     = {"Low":0, "Medium":1, "High":2}
-    occ_map     = {"Salaried":0, "Self-Employed":1, "Retired":2, "Student":3, "Unemployed":4}
-    policy_map  = {"Auto":0, "Health":1, "Life":2, "Property":3}
-
-    gender_num       = gender_map[gender]
-    loc_num          = loc_map[location]
-    inc_num          = inc_map[income_level]
-    occ_num          = occ_map[occupation]
-    policy_type_num  = policy_map[policy_type]
-
-    # ——— Build feature vector in exact order ———
-    # [age, gender_num, loc_num, inc_num, active_policies,
-    #  total_premium_paid, claim_frequency, policy_upgrades,
-    #  occ_num, coverage_amount, policy_type_num]
-    X = np.array([[
-        age,
-        gender_num,
-        loc_num,
-        inc_num,
-        active_policies,
-        total_premium_paid,
-        claim_frequency,
-        policy_upgrades,
-        occ_num,
-        coverage_amount,
-        policy_type_num
-    ]], dtype=float)
+    # (column order and mappings live in feature_schema.SEGMENT)
+    with span("customer_segmentation.features"):
+        X = SCHEMA.transform({
+            "Age":                       age,
+            "Gender":                    gender,
+            "Location":                  location,
+            "Income Level":              income_level,
+            "Number of Active Policies": active_policies,
+            "Total Premium Paid":        total_premium_paid,
+            "Claim Frequency":           claim_frequency,
+            "Policy Upgrades":           policy_upgrades,
+            "Occupation":                occupation,
+            "Coverage Amount":           coverage_amount,
+            "Policy Type":               policy_type,
+        })
 
     if st.button("Assign Segment"):
-        Xs      = scaler.transform(X)
-        cluster = kmeans.predict(Xs)[0]
-
-        cluster_labels = {
-            0: "Young Professionals",
-            1: "High-Value Clients",
-            2: "Frequent Claimers",
-            3: "Passive Buyers",
-            4: "Engaged Mid-Income"
-        }
-        segment = cluster_labels.get(cluster, f"Cluster {cluster}")
+        with span("customer_segmentation.predict"):
+            Xs      = scaler.transform(X)
+            cluster = kmeans.predict(Xs)[0]
+        segment = CLUSTER_LABELS.get(cluster, f"Cluster {cluster}")
 
         st.markdown(f"### 🏷️ Segment: **{segment}** (Cluster #{cluster})")
 
         # show distance to each center
         dists = kmeans.transform(Xs)[0]
         st.table({
-            "Segment": list(cluster_labels.values()),
+            "Segment": list(CLUSTER_LABELS.values()),
             "Distance": np.round(dists, 2)
         })
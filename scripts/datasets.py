@@ -0,0 +1,335 @@
+# scripts/datasets.py
+#
+# Typed, columnar access to the Dataset/ CSVs.
+#
+# Every dataset declares its column types below: low-cardinality strings are
+# categoricals (dictionary-encoded in Arrow), counts and flags the smallest
+# integer that holds them, amounts float64, IDs plain strings. The first read of
+# a CSV converts it, block by block, to a Parquet file under
+# .cache/datasets/ (IIRA_DATASET_CACHE); later reads come from there, with
+# only the requested columns and in row-group-sized chunks. A Parquet file is
+# rebuilt when its CSV's mtime or size, or the declared schema, changes.
+#
+#   python -m scripts.datasets convert              # convert every CSV present in Dataset/
+#   python -m scripts.datasets compare              # memory and load time, CSV vs Parquet
+#
+# Consumers pass a path or an uploaded file together with the dataset it is
+# shaped like: paths under Dataset/ go through the Parquet cache; other paths
+# and file-like objects (Streamlit uploads, stdin) are streamed with pandas
+# using the declared categoricals, so they leave nothing behind in the cache.
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+log = logging.getLogger(__name__)
+
+BASE       = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR   = os.path.join(BASE, "Dataset")
+CHUNK_ROWS = 50_000
+BLOCK_SIZE = 8 << 20   # CSV bytes parsed per conversion step, one row group each
+META_KEY   = b"iira.source"
+
+KINDS = {
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "text":     pa.string(),
+    "int8":     pa.int8(),
+    "int16":    pa.int16(),
+    "int32":    pa.int32(),
+    "float64":  pa.float64(),
+}
+
+def cache_dir():
+    return os.environ.get("IIRA_DATASET_CACHE", os.path.join(BASE, ".cache", "datasets"))
+
+# ---------------------- Schema ----------------------
+@dataclass(frozen=True)
+class Dataset:
+    """Declared column types of one CSV in Dataset/.
+
+    ``columns`` is a tuple of ``(column, kind)`` pairs, kind one of KINDS.
+    Columns a file has but the schema does not declare keep Arrow's inferred
+    type; declared columns a file lacks are simply absent.
+    """
+    name: str
+    file: str
+    columns: tuple
+
+    def path(self, data_dir=DATA_DIR):
+        return os.path.join(data_dir, self.file)
+
+    @property
+    def signature(self):
+        return hashlib.sha1(repr(self.columns).encode("utf-8")).hexdigest()[:12]
+
+    def categoricals(self):
+        return [c for c, kind in self.columns if kind == "category"]
+
+    def arrow_types(self):
+        return {c: KINDS[kind] for c, kind in self.columns}
+
+CS = Dataset("customers", "Insurance_CS.csv", (
+    ("Customer_ID",               "text"),
+    ("Age",                       "int8"),
+    ("Gender",                    "category"),
+    ("Location",                  "category"),
+    ("Income Level",              "category"),
+    ("Number of Active Policies", "int8"),
+    ("Total Premium Paid",        "float64"),
+    ("Claim Frequency",           "int8"),
+    ("Policy Upgrades",           "int8"),
+    ("Occupation",                "category"),
+    ("Coverage Amount",           "float64"),
+    ("Policy Type",               "category"),
+))
+
+CFS = Dataset("reviews", "Insurance_CFS.csv", (
+    ("Review_ID",       "text"),
+    ("Customer_ID",     "text"),
+    ("Service_Type",    "category"),
+    ("Rating",          "int8"),
+    ("Sentiment_Label", "category"),
+    # reviews repeat a small set of phrasings; each distinct text is stored once
+    ("Review_Text",     "category"),
+))
+
+FD = Dataset("claims", "Insurance_FD.csv", (
+    ("Policyholder_ID",  "text"),
+    ("Claim_Amount",     "float64"),
+    ("Claim_Type",       "category"),
+    ("Suspicious_Flags", "int8"),
+    ("High_Claim",       "int8"),
+    ("Fraud_Label",      "int8"),
+))
+
+RC = Dataset("policies", "Insurance_RC_CP.csv", (
+    ("Policy_ID",        "text"),
+    ("Customer_Age",     "int8"),
+    ("Gender",           "category"),
+    ("Policy_Type",      "category"),
+    ("Annual_Income",    "float64"),
+    ("Property_Age",     "int8"),
+    ("Claim_History",    "int8"),
+    ("Risk_Score",       "category"),
+    ("Premium_Amount",   "float64"),
+    ("Claim_Amount",     "float64"),
+    ("Fraudulent_Claim", "int8"),
+    ("Claim_to_Income",  "float64"),
+    ("Age_Risk_Factor",  "float64"),
+))
+
+FAQ = Dataset("faq", "insurance_faq_dataset.csv", (
+    ("instruction", "category"),
+    ("response",    "category"),
+))
+
+DATASETS = {d.name: d for d in (CS, CFS, FD, RC, FAQ)}
+
+# ---------------------- Conversion ----------------------
+def parquet_path(csv_path):
+    """Cache location of ``csv_path``'s Parquet copy, unique per absolute path."""
+    csv_path = os.path.abspath(csv_path)
+    stem     = os.path.splitext(os.path.basename(csv_path))[0]
+    digest   = hashlib.sha1(csv_path.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir(), f"{stem}-{digest}.parquet")
+
+def _source_stamp(csv_path, dataset):
+    st = os.stat(csv_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "schema": dataset.signature}
+
+def to_parquet(csv_path, dataset, out=None):
+    """Convert ``csv_path`` to Parquet with the declared types; returns the row count.
+
+    Parsed one BLOCK_SIZE block at a time, each written as its own row group,
+    so a CSV larger than memory converts in bounded memory.
+    """
+    out = out or parquet_path(csv_path)
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp    = f"{out}.{os.getpid()}.tmp"
+    stamp  = _source_stamp(csv_path, dataset)
+    reader = pv.open_csv(csv_path, read_options=pv.ReadOptions(block_size=BLOCK_SIZE),
+                         convert_options=pv.ConvertOptions(column_types=dataset.arrow_types()))
+    rows, writer = 0, None
+    try:
+        for batch in reader:
+            if writer is None:
+                schema = batch.schema.with_metadata({META_KEY: json.dumps(stamp).encode("utf-8")})
+                writer = pq.ParquetWriter(tmp, schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if writer is None:
+        raise ValueError(f"{csv_path} has no rows")
+    writer.close()
+    os.replace(tmp, out)
+    log.info("Converted %s (%d rows) to %s", csv_path, rows, out)
+    return rows
+
+_convert_lock = threading.Lock()
+
+def ensure_parquet(csv_path, dataset):
+    """Path of an up-to-date Parquet copy of ``csv_path``, converting it if needed."""
+    out = parquet_path(csv_path)
+    with _convert_lock:
+        try:
+            meta = pq.read_schema(out).metadata or {}
+            if json.loads(meta.get(META_KEY, b"null")) == _source_stamp(csv_path, dataset):
+                return out
+        except (FileNotFoundError, pa.ArrowInvalid):
+            pass
+        to_parquet(csv_path, dataset, out)
+    return out
+
+# ---------------------- Reading ----------------------
+def _in_data_dir(path):
+    data_dir = os.path.realpath(DATA_DIR)
+    try:
+        return os.path.commonpath([os.path.realpath(path), data_dir]) == data_dir
+    except ValueError:
+        # different drives on Windows (or a relative/absolute mix): certainly not under Dataset/
+        return False
+
+def _parquet_source(source, dataset):
+    """Parquet path for a path ``source``, or None to stream it with pandas instead."""
+    if not isinstance(source, (str, os.PathLike)) or source == "-":
+        return None
+    source = os.fspath(source)
+    if source.endswith(".parquet"):
+        return source
+    # only the project's own CSVs get a cached copy; an ad-hoc path would leave one behind for good
+    if not _in_data_dir(source):
+        return None
+    try:
+        return ensure_parquet(source, dataset)
+    except (OSError, ValueError) as e:
+        # a file that does not fit the declared types (or an unwritable cache) is still readable, just untyped
+        log.warning("Reading %s without the %s schema: %s", source, dataset.name, e)
+        return None
+
+def _pandas_dtypes(dataset, columns=None):
+    return {c: "category" for c in dataset.categoricals() if columns is None or c in columns}
+
+def _to_pandas(arrow):
+    # dictionaries come back in order of appearance; sort them as read_csv + astype("category") would
+    df = arrow.to_pandas()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].cat.reorder_categories(sorted(df[column].cat.categories))
+    return df
+
+def column_names(source, dataset):
+    """Column names of ``source`` without reading its rows."""
+    path = _parquet_source(source, dataset)
+    if path is not None:
+        return pq.read_schema(path).names
+    return list(pd.read_csv(source, nrows=0).columns)
+
+def read(source, dataset, columns=None):
+    """The whole of ``source`` (path or file-like) as a DataFrame, optionally only ``columns``."""
+    path = _parquet_source(source, dataset)
+    if path is not None:
+        return _to_pandas(pq.read_table(path, columns=columns))
+    return pd.read_csv(source, usecols=columns, dtype=_pandas_dtypes(dataset, columns))
+
+def iter_chunks(source, dataset, chunk_rows=CHUNK_ROWS, columns=None, skip_rows=0):
+    """DataFrames of up to ``chunk_rows`` rows of ``source``, after the first ``skip_rows``.
+
+    Only one chunk is materialised at a time. ``"-"`` reads CSV from stdin.
+    """
+    path = _parquet_source(source, dataset)
+    if path is None:
+        stream = sys.stdin if source == "-" else source
+        yield from pd.read_csv(stream, chunksize=chunk_rows, usecols=columns,
+                               dtype=_pandas_dtypes(dataset, columns), skiprows=range(1, skip_rows + 1))
+        return
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        yield _to_pandas(batch.slice(skip_rows))
+        skip_rows = 0
+
+# ---------------------- Writing ----------------------
+def write_scored(chunks, output_path, fmt="csv"):
+    """Stream scored chunks to ``output_path`` as CSV or Parquet; returns the row count."""
+    rows = 0
+    if fmt == "parquet":
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    table  = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=(i == 0), index=False)
+                rows += len(chunk)
+    return rows
+
+# ---------------------- CLI ----------------------
+def compare(dataset, data_dir=DATA_DIR):
+    """Load time and in-memory size of ``dataset`` via pd.read_csv and via its Parquet copy."""
+    path  = dataset.path(data_dir)
+    start = time.perf_counter()
+    plain = pd.read_csv(path)
+    csv_s = time.perf_counter() - start
+    cache = ensure_parquet(path, dataset)
+    start = time.perf_counter()
+    typed = read(cache, dataset)
+    pq_s  = time.perf_counter() - start
+    return {
+        "dataset": dataset.name,
+        "rows": len(typed),
+        "csv_mb": round(float(plain.memory_usage(deep=True).sum()) / 2**20, 2),
+        "parquet_mb": round(float(typed.memory_usage(deep=True).sum()) / 2**20, 2),
+        "csv_ms": round(csv_s * 1e3, 1),
+        "parquet_ms": round(pq_s * 1e3, 1),
+        "file_kb": round(os.path.getsize(cache) / 1024, 1),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Typed Parquet copies of the Dataset/ CSVs")
+    parser.add_argument("command", choices=["convert", "compare"])
+    parser.add_argument("names", nargs="*", help=f"datasets (default: all of {', '.join(DATASETS)})")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    for name in args.names or DATASETS:
+        dataset = DATASETS[name]
+        path    = dataset.path(args.data_dir)
+        if not os.path.exists(path):
+            print(f"skip {name}: {path} not found")
+        elif args.command == "convert":
+            rows = to_parquet(path, dataset)
+            print(f"{name:<10} {rows:>9,} rows -> {parquet_path(path)}")
+        else:
+            print(compare(dataset, args.data_dir))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,169 @@
+# scripts/faq_retriever.py
+#
+# TF-IDF index over the curated FAQ instructions, checked before the chatbot
+# runs FLAN-T5. Built once and persisted to .cache/, keyed by the dataset's
+# sha256 so editing the CSV triggers a rebuild.
+#
+#   python -m scripts.faq_retriever --rebuild
+#   python -m scripts.faq_retriever "how do i add a nominee"
+
+import argparse
+import hashlib
+import os
+import re
+import threading
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from scripts import datasets
+from scripts.generation_scheduler import normalize_query
+from scripts.instrumentation import cache_result
+
+BASE       = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FAQ_PATH   = os.path.join(BASE, "Dataset", "insurance_faq_dataset.csv")
+INDEX_PATH = os.path.join(BASE, ".cache", "faq_index.joblib")
+
+# Both must hold to answer from the FAQ instead of generating: cosine
+# similarity, and coverage, the share of the FAQ instruction's TF-IDF mass
+# found in the question. Coverage rejects questions broader than the FAQ
+# ("How do I file a claim?" vs the health-only claim FAQ: cosine 0.66,
+# coverage 0.49). Calibrated with benchmarks/faq_calibration.py on 41
+# paraphrases and 24 near misses / unrelated questions: together with the
+# KEY_TERMS check below, 37 answered and 1 near miss let through ("will my
+# premium increase with age"), against 37 and 5 without it. Any min_score
+# from 0.4 to 0.6 gives the same result on that set.
+MIN_SCORE    = 0.6
+MIN_COVERAGE = 0.5
+
+# Words that change what a question is about while barely moving the n-gram
+# scores ("car insurance claim" vs the health-claim FAQ). A match is refused
+# when question and FAQ each name a different term of the same group.
+KEY_TERMS = {
+    "line": {"health": "health", "medical": "health", "car": "motor", "motor": "motor", "vehicle": "motor",
+             "auto": "motor", "bike": "motor", "life": "life", "home": "home", "house": "home",
+             "property": "home", "travel": "travel"},
+    "subject": {"claim": "claim", "claims": "claim", "premium": "premium", "premiums": "premium",
+                "policy": "policy", "policies": "policy"},
+}
+WORD_RE = re.compile(r"[a-z]+")
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class FAQRetriever:
+    """Nearest FAQ instruction by character n-gram TF-IDF cosine similarity.
+
+    Character n-grams within word boundaries tolerate typos and inflections
+    ("nominee"/"nominees") that word TF-IDF would miss on such short texts.
+    ``lookup`` returns ``(response, score)`` when the best match clears
+    ``min_score`` and ``min_coverage`` and ``(None, score)`` otherwise, and
+    counts both so ``stats()`` can report the share of traffic served from
+    the index.
+    """
+
+    def __init__(self, vectorizer, matrix, instructions, responses, dataset_hash, min_score=MIN_SCORE,
+                 min_coverage=MIN_COVERAGE):
+        self.vectorizer   = vectorizer
+        self.matrix       = matrix
+        self.instructions = instructions
+        self.responses    = responses
+        self.dataset_hash = dataset_hash
+        self.min_score    = min_score
+        self.min_coverage = min_coverage
+        self.queries      = 0
+        self.hits         = 0
+        self._lock        = threading.Lock()
+
+    @classmethod
+    def build(cls, faq_path=FAQ_PATH, min_score=MIN_SCORE, min_coverage=MIN_COVERAGE):
+        faq = datasets.read(faq_path, datasets.FAQ, columns=["instruction", "response"])
+        faq = faq.astype(object).dropna(subset=["instruction", "response"])
+        # the dataset repeats instructions; the first response wins
+        faq = faq.drop_duplicates(subset="instruction").reset_index(drop=True)
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 5), sublinear_tf=True)
+        matrix     = vectorizer.fit_transform(faq["instruction"].map(normalize_query))
+        return cls(vectorizer, matrix, faq["instruction"].tolist(), faq["response"].tolist(),
+                   file_sha256(faq_path), min_score, min_coverage)
+
+    def save(self, index_path=INDEX_PATH):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        joblib.dump({
+            "vectorizer": self.vectorizer,
+            "matrix": self.matrix,
+            "instructions": self.instructions,
+            "responses": self.responses,
+            "dataset_hash": self.dataset_hash,
+        }, index_path)
+
+    @classmethod
+    def load_or_build(cls, faq_path=FAQ_PATH, index_path=INDEX_PATH, min_score=MIN_SCORE,
+                      min_coverage=MIN_COVERAGE, rebuild=False):
+        """The persisted index if it was built from the current dataset, otherwise a fresh one."""
+        current = file_sha256(faq_path)
+        if not rebuild and os.path.exists(index_path):
+            state = joblib.load(index_path)
+            if state.get("dataset_hash") == current:
+                return cls(min_score=min_score, min_coverage=min_coverage, **state)
+        retriever = cls.build(faq_path, min_score, min_coverage)
+        retriever.save(index_path)
+        return retriever
+
+    def search(self, query):
+        """(index, score, coverage) of the closest FAQ instruction."""
+        q      = self.vectorizer.transform([normalize_query(query)])
+        scores = (self.matrix @ q.T).toarray().ravel()
+        best   = int(np.argmax(scores))
+        # rows are L2-normalised, so the squared weights on shared n-grams sum to at most 1
+        faq    = self.matrix[best].toarray().ravel()
+        return best, float(scores[best]), float((faq[q.indices] ** 2).sum())
+
+    def accepts(self, score, coverage):
+        return score >= self.min_score and coverage >= self.min_coverage
+
+    def conflict(self, query, best):
+        """The first (question term, FAQ term) of a KEY_TERMS group that differ, or None."""
+        query_words = set(WORD_RE.findall(normalize_query(query)))
+        faq_words   = set(WORD_RE.findall(normalize_query(self.instructions[best])))
+        for terms in KEY_TERMS.values():
+            asked  = {terms[w] for w in query_words if w in terms}
+            stored = {terms[w] for w in faq_words if w in terms}
+            if asked - stored and stored - asked:
+                return min(asked - stored), min(stored - asked)
+        return None
+
+    def lookup(self, query):
+        best, score, coverage = self.search(query)
+        hit = self.accepts(score, coverage) and self.conflict(query, best) is None
+        with self._lock:
+            self.queries += 1
+            self.hits    += hit
+        cache_result("faq_retriever", hit)
+        return (self.responses[best] if hit else None), score
+
+    def stats(self):
+        return {
+            "faq_entries": len(self.instructions),
+            "queries": self.queries,
+            "served_by_retrieval": self.hits,
+            "retrieval_share": self.hits / self.queries if self.queries else 0.0,
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the FAQ retrieval index")
+    parser.add_argument("query", nargs="*", help="question to look up")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index even if it is current")
+    args = parser.parse_args()
+
+    retriever = FAQRetriever.load_or_build(rebuild=args.rebuild)
+    print(f"{len(retriever.instructions)} FAQ entries indexed -> {INDEX_PATH}")
+    if args.query:
+        query    = " ".join(args.query)
+        best, score, coverage = retriever.search(query)
+        conflict = retriever.conflict(query, best)
+        verdict  = ("answer" if retriever.accepts(score, coverage) and conflict is None else
+                    "fall through to generation" + (f", asks about {conflict[0]} not {conflict[1]}" if conflict else ""))
+        print(f"{score:.3f} / coverage {coverage:.3f} ({verdict}): {retriever.instructions[best]}\n"
+              f"{retriever.responses[best]}")
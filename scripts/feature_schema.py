@@ -0,0 +1,191 @@
+# scripts/feature_schema.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+YES_NO = {"No":0, "Yes":1, 0:0, 1:1, "0":0, "1":1}
+
+# ---------------------- Feature Kinds ----------------------
+@dataclass(frozen=True)
+class Numeric:
+    """Raw numeric column, copied through as float64."""
+    column: str
+
+    @property
+    def names(self):
+        return [self.column]
+
+    def fill(self, out, values):
+        out[:, 0] = values
+
+@dataclass(frozen=True)
+class Ordinal:
+    """Label-encoded categorical; unknown categories are an error."""
+    column: str
+    mapping: dict
+
+    @property
+    def names(self):
+        return [self.column]
+
+    def fill(self, out, values):
+        codes = pd.Series(values).map(self.mapping).to_numpy(dtype=float)
+        bad = np.isnan(codes)
+        if bad.any():
+            unknown = sorted({str(v) for v in np.asarray(values, dtype=object)[bad]})
+            raise ValueError(f"Unknown {self.column!r} value(s): {unknown}")
+        out[:, 0] = codes
+
+@dataclass(frozen=True)
+class OneHot:
+    """One-hot categorical in a fixed category order; unknown categories encode as all zeros."""
+    column: str
+    categories: tuple
+
+    @property
+    def names(self):
+        return [f"{self.column}_{c}" for c in self.categories]
+
+    def fill(self, out, values):
+        values = np.asarray(values, dtype=object)
+        out[:] = values[:, None] == np.asarray(self.categories, dtype=object)[None, :]
+
+# ---------------------- Schema ----------------------
+@dataclass(frozen=True)
+class FeatureSchema:
+    """Declarative feature layout of one trained model and its scaler.
+
+    ``transform`` turns a DataFrame, a list of dicts or a single dict keyed by
+    the dataset's column names into the exact float64 matrix the artifact was
+    fitted on, so the Streamlit forms and the batch jobs share one encoder.
+    """
+    name: str
+    model_file: str
+    scaler_file: str
+    features: tuple
+
+    @property
+    def feature_names(self):
+        return [n for f in self.features for n in f.names]
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    @property
+    def columns(self):
+        return [f.column for f in self.features]
+
+    def column_groups(self):
+        """(n_features, n_columns) 0/1 matrix mapping encoded features back to their input column."""
+        groups = np.zeros((self.n_features, len(self.features)))
+        start  = 0
+        for j, f in enumerate(self.features):
+            groups[start:start + len(f.names), j] = 1.0
+            start += len(f.names)
+        return groups
+
+    def transform(self, data):
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame.from_records(data)
+
+        missing = [c for c in self.columns if c not in data.columns]
+        if missing:
+            raise KeyError(f"{self.name}: missing input column(s) {missing}")
+
+        X = np.empty((len(data), self.n_features), dtype=np.float64)
+        start = 0
+        for f in self.features:
+            width = len(f.names)
+            f.fill(X[:, start:start + width], data[f.column].to_numpy())
+            start += width
+        return X
+
+    def check(self, *estimators):
+        """Raise if a fitted estimator expects a different number of features."""
+        for est in estimators:
+            expected = getattr(est, "n_features_in_", None)
+            if expected is not None and expected != self.n_features:
+                raise ValueError(
+                    f"{self.name}: {type(est).__name__} expects {expected} features, "
+                    f"schema produces {self.n_features}"
+                )
+
+# ---------------------- Model Schemas ----------------------
+# Category orders follow each model's training notebook and are NOT
+# interchangeable: the risk model was fitted Health-first / Male-first, the
+# claim model on alphabetical get_dummies output (Auto-first / Female-first).
+# Ordinal codes reproduce sklearn's LabelEncoder, i.e. alphabetical order.
+
+RISK = FeatureSchema(
+    name="risk_classifier",
+    model_file="risk_classification_rfc.pkl",
+    scaler_file="scaler_rc.pkl",
+    features=(
+        Numeric("Customer_Age"),
+        Numeric("Annual_Income"),
+        Numeric("Property_Age"),
+        Numeric("Claim_History"),
+        Numeric("Premium_Amount"),
+        Numeric("Claim_Amount"),
+        Ordinal("Fraudulent_Claim", YES_NO),
+        OneHot("Gender", ("Male", "Female")),
+        OneHot("Policy_Type", ("Health", "Auto", "Life", "Property")),
+        Numeric("Claim_to_Income"),
+        Numeric("Age_Risk_Factor"),
+    ),
+)
+
+CLAIM = FeatureSchema(
+    name="claim_predictor",
+    model_file="claim_prediction_rfr.pkl",
+    scaler_file="scaler_cp.pkl",
+    features=(
+        Numeric("Customer_Age"),
+        Numeric("Annual_Income"),
+        Numeric("Property_Age"),
+        Numeric("Claim_History"),
+        Ordinal("Risk_Score", {"High":0, "Low":1, "Medium":2}),
+        Numeric("Premium_Amount"),
+        Ordinal("Fraudulent_Claim", YES_NO),
+        Numeric("Claim_to_Income"),
+        Numeric("Age_Risk_Factor"),
+        OneHot("Gender", ("Female", "Male")),
+        OneHot("Policy_Type", ("Auto", "Health", "Life", "Property")),
+    ),
+)
+
+SEGMENT = FeatureSchema(
+    name="customer_segmentation",
+    model_file="customer_segmentation_kmeans.pkl",
+    scaler_file="scaler_cs.pkl",
+    features=(
+        Numeric("Age"),
+        Ordinal("Gender", {"Female":0, "Male":1}),
+        Ordinal("Location", {"Rural":0, "Suburban":1, "Urban":2}),
+        Ordinal("Income Level", {"High":0, "Low":1, "Medium":2}),
+        Numeric("Number of Active Policies"),
+        Numeric("Total Premium Paid"),
+        Numeric("Claim Frequency"),
+        Numeric("Policy Upgrades"),
+        Ordinal("Occupation", {"Business Owner":0, "Retired":1, "Salaried":2, "Self-Employed":3, "Student":4}),
+        Numeric("Coverage Amount"),
+        Ordinal("Policy Type", {"Auto":0, "Health":1, "Life":2, "Property":3}),
+    ),
+)
+
+FRAUD = FeatureSchema(
+    name="fraud_detector",
+    model_file="fraud_detection_if.pkl",
+    scaler_file="scaler_fd.pkl",
+    features=(
+        Numeric("Claim_Amount"),
+        Numeric("High_Claim"),
+        OneHot("Claim_Type", ("Medical", "Vehicle", "Home Damage")),
+        Ordinal("Suspicious_Flags", YES_NO),
+    ),
+)
@@ -1,23 +1,54 @@
 # scripts/fraud_detection_manual_v2.py
 
+import json
 import os
-import numpy as np
-import joblib
+import warnings
+
 import streamlit as st
 
-@st.cache_resource
+from scripts import datasets, model_registry
+from scripts.feature_schema import FRAUD as SCHEMA
+from scripts.instrumentation import span
+
+# High_Claim is "Claim_Amount above the training median". The median is saved
+# next to the model (python -m scripts.fraud_stream Dataset/Insurance_FD.csv
+# --save-threshold); FALLBACK_THRESHOLD is only used until it has been.
+THRESHOLD_FILE     = "fraud_high_claim.json"
+FALLBACK_THRESHOLD = 50000
+
 def load_artifacts():
-    BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    model_path = os.path.join(BASE, "models", "fraud_detection_if.pkl")
-    scaler_path = os.path.join(BASE, "models", "scaler_fd.pkl")
-    
-    model = joblib.load(model_path)
-    scaler = joblib.load(scaler_path)
+    # current version from models/manifest.json (see scripts/model_registry.py)
+    model  = model_registry.load(SCHEMA, "model")
+    scaler = model_registry.load(SCHEMA, "scaler")
+    SCHEMA.check(scaler, model)
     return model, scaler
 
+def _read_threshold(path):
+    with open(path, encoding="utf-8") as f:
+        return float(json.load(f)["claim_amount_median"])
+
+def high_claim_threshold():
+    """Median training Claim_Amount from models/, or FALLBACK_THRESHOLD if none was saved."""
+    try:
+        return model_registry.registry().get(SCHEMA.name, "threshold", _read_threshold, default=THRESHOLD_FILE)
+    except FileNotFoundError:
+        warnings.warn(f"No {THRESHOLD_FILE} in the models dir; High_Claim uses the "
+                      f"{FALLBACK_THRESHOLD:,} stand-in", RuntimeWarning)
+        return FALLBACK_THRESHOLD
+
+def save_threshold(source, out=None):
+    """Write the median Claim_Amount of ``source`` (the training claims) as the High_Claim threshold."""
+    amounts = datasets.read(source, datasets.FD, columns=["Claim_Amount"])["Claim_Amount"]
+    median  = float(amounts.median())
+    out     = out or os.path.join(model_registry.models_dir(), THRESHOLD_FILE)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"claim_amount_median": median, "rows": len(amounts)}, f)
+    return median
+
 def predict_fraud(features, model, scaler):
-    features_scaled = scaler.transform(features)
-    prediction = model.predict(features_scaled)[0]
+    with span("fraud_detector.predict"):
+        features_scaled = scaler.transform(features)
+        prediction = model.predict(features_scaled)[0]
     prediction_label = "Fraud" if prediction == -1 else "Normal"
     return prediction_label
 
@@ -31,23 +62,22 @@ def run():
     claim_amount = st.number_input("Claim Amount (₹)", min_value=0.0, step=1000.0, value=5000.0)
 
     suspicious_flag = st.selectbox("Suspicious Flags Present?", ["No", "Yes"])
-    suspicious_flag_num = 1 if suspicious_flag == "Yes" else 0
 
     claim_type = st.selectbox("Claim Type", ["Medical", "Vehicle", "Home Damage"])
 
     # ------- Feature Engineering --------
-    # High_Claim calculation (compared to median later, but for demo we simulate)
-    # You can define a threshold manually if you want
-    # For now assume: > 50000 is high
-    high_claim = 1 if claim_amount > 50000 else 0
-
-    medical_claim = 1 if claim_type == "Medical" else 0
-    vehicle_claim = 1 if claim_type == "Vehicle" else 0
-    home_damage_claim = 1 if claim_type == "Home Damage" else 0
+    # High_Claim: above the median claim of the training data, as in training
+    high_claim = 1 if claim_amount > high_claim_threshold() else 0
 
-    # Arrange features in same order as training
+    # Arrange features in same order as training (see feature_schema.FRAUD)
     # Claim_Amount, High_Claim, Medical_Claim, Vehicle_Claim, Home_Damage_Claim, Suspicious_Flags
-    X = np.array([[claim_amount, high_claim, medical_claim, vehicle_claim, home_damage_claim, suspicious_flag_num]])
+    with span("fraud_detector.features"):
+        X = SCHEMA.transform({
+            "Claim_Amount":     claim_amount,
+            "High_Claim":       high_claim,
+            "Claim_Type":       claim_type,
+            "Suspicious_Flags": suspicious_flag,
+        })
 
     if st.button("Predict Fraud"):
         result = predict_fraud(X, model, scaler)
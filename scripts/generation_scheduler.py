@@ -0,0 +1,175 @@
+# scripts/generation_scheduler.py
+
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from queue import Empty, Queue
+
+from scripts.instrumentation import cache_result
+
+MAX_BATCH   = 8
+MAX_WAIT_MS = 20.0
+CACHE_SIZE  = 512
+BUCKETS     = (1, 2, 4, 8, 16, 32)
+
+SPACE_RE = re.compile(r"\s+")
+TRAIL_RE = re.compile(r"[\s?!.]+$")
+
+def normalize_query(query):
+    """Cache key for a question: case, spacing and trailing punctuation don't matter."""
+    return TRAIL_RE.sub("", SPACE_RE.sub(" ", query.strip().lower()))
+
+class GenerationScheduler:
+    """Shared front-end that batches prompts from every session into one generate call.
+
+    ``submit()`` may be called from any number of threads (Streamlit runs one
+    per session). A single worker thread takes the first waiting prompt,
+    keeps collecting for up to ``max_wait`` seconds or ``max_batch`` prompts,
+    and runs them through the pipeline as one padded batch. Answers are kept
+    in an LRU cache keyed by the normalised question, and identical questions
+    already waiting share one generation.
+    """
+
+    def __init__(self, generator, prompt_fn=lambda q: q, max_batch=MAX_BATCH,
+                 max_wait=MAX_WAIT_MS / 1000, cache_size=CACHE_SIZE, **generate_kwargs):
+        self.generator       = generator
+        self.prompt_fn       = prompt_fn
+        self.max_batch       = max_batch
+        self.max_wait        = max_wait
+        self.cache_size      = cache_size
+        self.generate_kwargs = generate_kwargs
+
+        self.queue    = Queue()
+        self.cache    = OrderedDict()
+        self.pending  = {}
+        self.lock     = threading.Lock()
+        self.closed   = False
+
+        self.requests   = 0
+        self.cache_hits = 0
+        self.coalesced  = 0
+        self.batches    = 0
+        self.generated  = 0
+        self.errors     = 0
+        self.sizes      = Counter()
+        self.last_ms    = 0.0
+
+        self.worker = threading.Thread(target=self._run, name="generation-scheduler", daemon=True)
+        self.worker.start()
+
+    # ---------------------- Client Side ----------------------
+    def submit(self, query, timeout=None):
+        """Answer for ``query``, from the cache or the next batch; blocks until ready."""
+        key = normalize_query(query)
+        with self.lock:
+            self.requests += 1
+            cache_result("generation_scheduler", key in self.cache)
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.cache_hits += 1
+                return self.cache[key]
+            future = self.pending.get(key)
+            if future is None:
+                if self.closed:
+                    raise RuntimeError("GenerationScheduler is closed")
+                future = self.pending[key] = Future()
+                self.queue.put((key, query, future))
+            else:
+                self.coalesced += 1
+        return future.result(timeout)
+
+    def cached(self, query):
+        """Cached answer for ``query``, or None; counted like a ``submit()``."""
+        key = normalize_query(query)
+        with self.lock:
+            self.requests += 1
+            cache_result("generation_scheduler", key in self.cache)
+            if key not in self.cache:
+                return None
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return self.cache[key]
+
+    def remember(self, query, answer):
+        """Cache an answer generated outside the scheduler (e.g. streamed)."""
+        with self.lock:
+            self._store(normalize_query(query), answer)
+
+    def close(self):
+        """Answer what is already queued, then stop the worker (and release the generator)."""
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.queue.put(None)
+
+    # ---------------------- Worker ----------------------
+    def _store(self, key, answer):
+        # caller holds self.lock
+        self.cache[key] = answer
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _collect(self):
+        batch    = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch   = self._collect()
+            if batch[-1] is None:
+                batch.pop()
+                if not batch:
+                    self.generator = None
+                    return
+                self.queue.put(None)
+            prompts = [self.prompt_fn(query) for _, query, _ in batch]
+            start   = time.perf_counter()
+            try:
+                outputs = self.generator(prompts, batch_size=len(prompts), **self.generate_kwargs)
+                answers = [(o[0] if isinstance(o, list) else o)["generated_text"] for o in outputs]
+            except Exception as e:
+                with self.lock:
+                    self.errors += 1
+                    for key, _, future in batch:
+                        self.pending.pop(key, None)
+                        future.set_exception(e)
+                continue
+            finally:
+                self.last_ms = (time.perf_counter() - start) * 1000
+
+            with self.lock:
+                self.batches   += 1
+                self.generated += len(batch)
+                self.sizes[str(next((b for b in BUCKETS if len(batch) <= b), f">{BUCKETS[-1]}"))] += 1
+                for (key, _, future), answer in zip(batch, answers):
+                    self._store(key, answer)
+                    self.pending.pop(key, None)
+                    future.set_result(answer)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "cache_hits": self.cache_hits,
+                "cache_hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "generated": self.generated,
+                "mean_batch_size": self.generated / self.batches if self.batches else 0.0,
+                "batch_size_histogram": dict(self.sizes),
+                "queue_depth": self.queue.qsize(),
+                "errors": self.errors,
+                "last_batch_ms": round(self.last_ms, 3),
+            }
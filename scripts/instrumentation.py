@@ -0,0 +1,234 @@
+# scripts/instrumentation.py
+#
+# Timing spans and counters for the app's hot paths, exported in Prometheus
+# text format (GET /metrics on scripts/scoring_service.py, or the download
+# button in the diagnostics panel of streamlit_main).
+#
+# Off unless IIRA_METRICS=1. While off, span() hands back one shared no-op
+# context manager and count() returns immediately, so instrumented code
+# pays a function call per span and nothing else.
+#
+# Span names are "<module>.<stage>", stage one of load / features / predict /
+# render (plus a few module-specific ones such as summarizer.extract);
+# "<module>.page" is the whole script run of that page in streamlit_main.
+
+import functools
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+_enabled = os.environ.get("IIRA_METRICS", "0") == "1"
+_lock    = threading.Lock()
+_local   = threading.local()
+
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+RECENT  = 512
+
+def enabled():
+    return _enabled
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+# ---------------------- Storage ----------------------
+class SpanStats:
+    __slots__ = ("count", "total", "max", "errors", "buckets", "recent")
+
+    def __init__(self):
+        self.count   = 0
+        self.total   = 0.0
+        self.max     = 0.0
+        self.errors  = 0
+        self.buckets = [0] * len(BUCKETS)
+        self.recent  = deque(maxlen=RECENT)
+
+    def add(self, seconds, error=False):
+        self.count  += 1
+        self.total  += seconds
+        self.max     = max(self.max, seconds)
+        self.errors += error
+        self.recent.append(seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+_spans    = defaultdict(SpanStats)
+_counters = defaultdict(float)
+
+def observe(name, seconds, error=False):
+    if not _enabled:
+        return
+    with _lock:
+        _spans[name].add(seconds, error)
+
+def count(name, value=1, **labels):
+    """Increment counter ``name`` with the given labels."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += value
+
+def cache_result(cache, hit, n=1):
+    """Count ``n`` lookups of ``cache`` that hit (or missed)."""
+    count("iira_cache_requests_total", n, cache=cache, result="hit" if hit else "miss")
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+# ---------------------- Spans ----------------------
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+def span(name):
+    """``with span("risk_classifier.predict"):`` times the block when metrics are on."""
+    return _Span(name) if _enabled else _NOOP
+
+# ---------------------- Cached Loaders ----------------------
+def _instrument_cache(st_decorator, name, kind, **st_kwargs):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            # only runs on a cache miss
+            _local.miss = True
+            with span(f"{name}.load" if kind == "loader" else name):
+                return fn(*args, **kwargs)
+
+        cached = st_decorator(**st_kwargs)(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return cached(*args, **kwargs)
+            outer, _local.miss = getattr(_local, "miss", False), False
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                miss, _local.miss = _local.miss, outer
+                if kind == "loader":
+                    count("iira_loader_calls_total", loader=name, state="cold" if miss else "warm")
+                else:
+                    cache_result(name, not miss)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorate
+
+def cached_resource(name, **st_kwargs):
+    """``st.cache_resource`` that counts cold (body ran) and warm (cached) loads of ``name``."""
+    import streamlit as st
+    return _instrument_cache(st.cache_resource, name, "loader", **st_kwargs)
+
+def cached_data(name, **st_kwargs):
+    """``st.cache_data`` that counts hits and misses and times the misses."""
+    import streamlit as st
+    return _instrument_cache(st.cache_data, name, "data", **st_kwargs)
+
+# ---------------------- Export ----------------------
+def _labels(pairs):
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+def prometheus_text():
+    with _lock:
+        spans    = {name: (s.count, s.total, s.errors, list(s.buckets)) for name, s in _spans.items()}
+        counters = dict(_counters)
+
+    lines = []
+    if spans:
+        lines += ["# HELP iira_span_seconds Duration of instrumented spans.", "# TYPE iira_span_seconds histogram"]
+        for name, (n, total, _, buckets) in sorted(spans.items()):
+            cumulative = 0
+            for bound, hits in zip(BUCKETS, buckets):
+                cumulative += hits
+                lines.append(f"iira_span_seconds_bucket{_labels([('span', name), ('le', bound)])} {cumulative}")
+            lines.append(f"iira_span_seconds_bucket{_labels([('span', name), ('le', '+Inf')])} {n}")
+            lines.append(f"iira_span_seconds_sum{_labels([('span', name)])} {total:.6f}")
+            lines.append(f"iira_span_seconds_count{_labels([('span', name)])} {n}")
+        lines += ["# HELP iira_span_errors_total Spans that exited with an exception.",
+                  "# TYPE iira_span_errors_total counter"]
+        for name, (_, _, errors, _) in sorted(spans.items()):
+            lines.append(f"iira_span_errors_total{_labels([('span', name)])} {errors}")
+
+    names = sorted({name for name, _ in counters})
+    for metric in names:
+        lines.append(f"# TYPE {metric} counter")
+        for (name, labels), value in sorted(counters.items()):
+            if name == metric:
+                lines.append(f"{name}{_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+def span_summary():
+    """One row per span with count, mean, p50, p95 and max in milliseconds."""
+    with _lock:
+        items = [(name, s.count, s.total, s.max, s.errors, np.asarray(s.recent)) for name, s in _spans.items()]
+    return [
+        {
+            "span": name,
+            "count": n,
+            "mean_ms": round(total / n * 1e3, 3),
+            "p50_ms": round(float(np.percentile(recent, 50)) * 1e3, 3),
+            "p95_ms": round(float(np.percentile(recent, 95)) * 1e3, 3),
+            "max_ms": round(peak * 1e3, 3),
+            "errors": errors,
+        }
+        for name, n, total, peak, errors, recent in sorted(items)
+    ]
+
+def counter_summary():
+    with _lock:
+        return [
+            {"counter": name, **dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items(), key=lambda kv: (kv[0][0], kv[0][1]))
+        ]
+
+def render_panel():
+    """Diagnostics panel: span timings, counters and a Prometheus download."""
+    import pandas as pd
+    import streamlit as st
+
+    spans = span_summary()
+    if spans:
+        st.dataframe(pd.DataFrame(spans), hide_index=True, use_container_width=True)
+    else:
+        st.caption("No spans recorded yet.")
+    counters = counter_summary()
+    if counters:
+        st.dataframe(pd.DataFrame(counters), hide_index=True, use_container_width=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Prometheus metrics", prometheus_text(), file_name="iira_metrics.prom",
+                           mime="text/plain")
+    with col2:
+        if st.button("Reset metrics"):
+            reset()
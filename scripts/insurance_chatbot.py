@@ -1,48 +1,160 @@
 # scripts/insurance_chatbot.py
 
+import logging
+import threading
+from collections import deque
+
 import streamlit as st
-from transformers import T5ForConditionalGeneration, T5Tokenizer, pipeline
+import torch
+from transformers import (StoppingCriteria, StoppingCriteriaList, T5ForConditionalGeneration, T5Tokenizer,
+                          TextIteratorStreamer, pipeline)
+
+from scripts import model_registry, model_runtime
+from scripts.faq_retriever import FAQRetriever
+from scripts.generation_scheduler import GenerationScheduler
+from scripts.instrumentation import cached_resource, span
+
+GENERATION_KWARGS = {"max_length": 100, "do_sample": False}
+# messages kept per session (You + Bot = 2 per question)
+MAX_HISTORY = 40
+
+log = logging.getLogger(__name__)
 
-@st.cache_resource
 def load_insurance_bot():
-    model_path = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\models\flan_t5_insurance"
+    # keyed by the registered version, so activating a new one reloads without a restart
+    return _load_insurance_bot(model_registry.current_version("flan_t5_insurance"))
+
+@cached_resource("insurance_chatbot.load_insurance_bot", max_entries=1)
+def _load_insurance_bot(version):
+    # models/flan_t5_insurance unless IIRA_MODELS_DIR says otherwise (see scripts/model_runtime.py)
+    model_path = model_runtime.resolve_model_dir("flan_t5_insurance")
     tokenizer = T5Tokenizer.from_pretrained(model_path)
-    model = T5ForConditionalGeneration.from_pretrained(model_path)
+    model = model_runtime.load_model(T5ForConditionalGeneration, "flan_t5_insurance")
     generator = pipeline("text2text-generation", model=model, tokenizer=tokenizer)
-    return generator
+    return model_runtime.timed(generator, "flan_t5_insurance")
+
+@cached_resource("insurance_chatbot.load_faq_retriever")
+def load_faq_retriever():
+    return FAQRetriever.load_or_build()
+
+_scheduler = None
+
+def load_scheduler():
+    global _scheduler
+    scheduler = _load_scheduler(model_registry.current_version("flan_t5_insurance"))
+    if scheduler is not _scheduler:
+        # a new model version was activated: let the old worker drain and exit
+        if _scheduler is not None:
+            _scheduler.close()
+        _scheduler = scheduler
+    return scheduler
+
+@cached_resource("insurance_chatbot.load_scheduler", max_entries=1)
+def _load_scheduler(version):
+    # one scheduler for all sessions, so concurrent questions share padded batches
+    return GenerationScheduler(_load_insurance_bot(version), prompt_fn=build_prompt, **GENERATION_KWARGS)
+
+def build_prompt(query):
+    return f"Answer the following INSURANCE-RELATED question accurately and politely:\n\nQuestion: {query}\n\nAnswer:"
 
 def generate_insurance_response(generator, query):
-    prompt = f"Answer the following INSURANCE-RELATED question accurately and politely:\n\nQuestion: {query}\n\nAnswer:"
-    result = generator(prompt, max_length=100, do_sample=False)
+    result = generator(build_prompt(query), **GENERATION_KWARGS)
     return result[0]['generated_text']
 
+# ---------------------- Streaming ----------------------
+class CancelOnEvent(StoppingCriteria):
+    """Stops generate() at the next decoding step once the event is set."""
+
+    def __init__(self, event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool)
+
+def stream_insurance_response(generator, query, cancel_event):
+    """Yield the answer piece by piece as generate() decodes it on a background thread."""
+    streamer = TextIteratorStreamer(generator.tokenizer, skip_prompt=True, skip_special_tokens=True)
+    inputs   = generator.tokenizer(build_prompt(query), return_tensors="pt")
+    kwargs   = dict(**inputs, streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([CancelOnEvent(cancel_event)]), **GENERATION_KWARGS)
+
+    def generate():
+        try:
+            generator.model.generate(**kwargs)
+        except Exception:
+            log.exception("streaming generation failed")
+            # marks the partial answer as incomplete, so it is not cached
+            cancel_event.set()
+            streamer.end()
+
+    threading.Thread(target=generate, name="chatbot-stream", daemon=True).start()
+    yield from streamer
+
 
 def run():
     st.title("🤖 AI Insurance Chatbot")
     st.subheader("Ask your insurance-related questions!")
 
-    generator = load_insurance_bot()
+    retriever = load_faq_retriever()
 
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+    # bounded, so long sessions don't grow memory and rerender cost without limit
+    if not isinstance(st.session_state.get("chat_history"), deque):
+        st.session_state.chat_history = deque(st.session_state.get("chat_history", []), maxlen=MAX_HISTORY)
+    history = st.session_state.chat_history
 
     user_input = st.text_input("💬 You:", "")
+    stream = st.toggle("⚡ Stream answers as they are generated", value=True)
+    streaming_question = None
 
     if st.button("Ask"):
         if user_input.strip() == "":
             st.warning("⚠️ Please type a question.")
         else:
-            with st.spinner("Thinking... 🤔"):
-                bot_response = generate_insurance_response(generator, user_input)
-                st.session_state.chat_history.append(("You", user_input))
-                st.session_state.chat_history.append(("Bot", bot_response))
+            # a new question cancels an answer that is still being streamed
+            if "cancel_event" in st.session_state:
+                st.session_state.cancel_event.set()
+
+            # curated FAQ answers first; only unmatched questions reach the model
+            with span("insurance_chatbot.retrieval"):
+                bot_response, _ = retriever.lookup(user_input)
+            if bot_response is None and stream:
+                # a question already answered (streamed or batched) is served from the shared cache
+                bot_response = load_scheduler().cached(user_input)
+            if bot_response is not None:
+                history.extend([("You", user_input), ("Bot", bot_response)])
+            elif stream:
+                streaming_question = user_input
+            else:
+                with st.spinner("Thinking... 🤔"), span("insurance_chatbot.predict"):
+                    bot_response = load_scheduler().submit(user_input)
+                history.extend([("You", user_input), ("Bot", bot_response)])
 
     # Display conversation history
-    for sender, message in st.session_state.chat_history:
-        if sender == "You":
-            st.markdown(f"🧑‍💼 **You:** {message}")
-        else:
-            st.markdown(f"🤖 **Bot:** {message}")
+    with span("insurance_chatbot.render"):
+        for sender, message in history:
+            if sender == "You":
+                st.markdown(f"🧑‍💼 **You:** {message}")
+            else:
+                st.markdown(f"🤖 **Bot:** {message}")
+
+    if streaming_question is not None:
+        st.markdown(f"🧑‍💼 **You:** {streaming_question}")
+        cancel_event = st.session_state.cancel_event = threading.Event()
+        placeholder, answer = st.empty(), ""
+        placeholder.markdown("🤖 **Bot:** …")
+        generator = load_insurance_bot()
+        with span("insurance_chatbot.stream"):
+            for piece in stream_insurance_response(generator, streaming_question, cancel_event):
+                answer += piece
+                placeholder.markdown(f"🤖 **Bot:** {answer}▌")
+        placeholder.markdown(f"🤖 **Bot:** {answer}")
+        if answer and not cancel_event.is_set():
+            load_scheduler().remember(streaming_question, answer)
+        history.extend([("You", streaming_question), ("Bot", answer)])
+
+    stats = retriever.stats()
+    if stats["queries"]:
+        st.caption(f"📚 {stats['retrieval_share']:.0%} of {stats['queries']} questions answered from the FAQ index")
 
 if __name__ == "__main__":
     run()
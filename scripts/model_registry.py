@@ -0,0 +1,317 @@
+# scripts/model_registry.py
+#
+# Versioned model artifacts behind one loader.
+#
+# models/manifest.json lists every model bundle, its versions, the files of
+# each version and their sha256:
+#
+#   {"format": 1, "models": {"risk_classifier": {"current": "2", "versions": {
+#       "1": {"created": "...", "files": {"model":  {"path": "risk_classification_rfc.pkl", "sha256": "..."},
+#                                         "scaler": {"path": "scaler_rc.pkl", "sha256": "..."}}},
+#       "2": {...}}}}}
+#
+#   python -m scripts.model_registry init                                   # manifest for the files already in models/
+#   python -m scripts.model_registry register risk_classifier 2 --model rfc.pkl --scaler scaler.pkl
+#   python -m scripts.model_registry activate risk_classifier 1             # roll back
+#   python -m scripts.model_registry list | verify
+#
+# Artifacts are loaded on first use. Pickles go through joblib with
+# mmap_mode="r" and forests additionally through their compiled .forest file
+# mapped read-only, so server processes share those pages through the OS
+# page cache. Every load stats the manifest; when it has changed (register /
+# activate), the next call loads the new version, so running apps pick it up
+# without a restart. Without a manifest the files named in feature_schema are
+# used unversioned, as before.
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+
+import joblib
+
+from scripts.instrumentation import count, span
+
+log = logging.getLogger(__name__)
+
+BASE          = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MANIFEST_FILE = "manifest.json"
+FORMAT        = 1
+
+def models_dir():
+    return os.environ.get("IIRA_MODELS_DIR", os.path.join(BASE, "models"))
+
+def sha256_of(path, block=1 << 20):
+    """sha256 of a file, or of a directory's relative paths and file contents."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                digest.update(os.path.relpath(full, path).replace(os.sep, "/").encode("utf-8"))
+                digest.update(sha256_of(full, block).encode("ascii"))
+        return digest.hexdigest()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# ---------------------- Registry ----------------------
+class ModelRegistry:
+    def __init__(self, root=None):
+        self.root   = root or models_dir()
+        self.path   = os.path.join(self.root, MANIFEST_FILE)
+        self._lock  = threading.RLock()
+        self._stamp = None
+        self._data  = {"format": FORMAT, "models": {}}
+        # "name.role[@variant]" -> (token, object); token changes with the artifact's version
+        self._loaded = {}
+
+    # ---------- manifest ----------
+    def manifest(self):
+        """The manifest, re-read whenever the file's mtime or size changed."""
+        try:
+            st    = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            if stamp != self._stamp:
+                if stamp is None:
+                    self._data = {"format": FORMAT, "models": {}}
+                else:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._data = json.load(f)
+                    log.info("Read model manifest %s", self.path)
+                self._stamp = stamp
+            return self._data
+
+    def write_manifest(self, data):
+        # atomic replace, so readers never see a half-written manifest
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def current_version(self, name):
+        entry = self.manifest()["models"].get(name)
+        return entry["current"] if entry else None
+
+    def artifact(self, name, role, default=None):
+        """(absolute path, sha256 or None, version) of one file of the current version."""
+        entry = self.manifest()["models"].get(name)
+        if entry is None or role not in entry["versions"][entry["current"]]["files"]:
+            if default is None:
+                raise KeyError(f"{name}/{role} is not in {self.path}")
+            return os.path.join(self.root, default), None, None
+        meta = entry["versions"][entry["current"]]["files"][role]
+        return os.path.join(self.root, meta["path"]), meta["sha256"], entry["current"]
+
+    # ---------- loading ----------
+    def get(self, name, role, load_fn, default=None, verify=True, variant=None):
+        """``load_fn(path)`` of the current ``name``/``role`` artifact, loaded once per version.
+
+        ``variant`` caches a second object derived from the same file (the
+        compiled forest next to a pickle) under its own key.
+        """
+        path, sha, version = self.artifact(name, role, default)
+        key    = f"{name}.{role}" + (f"@{variant}" if variant else "")
+        token  = (path, sha)
+        cached = self._loaded.get(key)
+        if cached is not None and cached[0] == token:
+            count("iira_loader_calls_total", loader=key, state="warm")
+            return cached[1]
+
+        with self._lock:
+            cached = self._loaded.get(key)
+            if cached is not None and cached[0] == token:
+                return cached[1]
+            with span(f"model_registry.{key}.load"):
+                # files only: hashing a multi-GB transformers directory on every start is left to `verify`
+                if verify and sha and os.path.isfile(path) and sha256_of(path) != sha:
+                    raise ValueError(f"Checksum mismatch for {path}; re-register {name} version {version}")
+                obj = load_fn(path)
+            count("iira_loader_calls_total", loader=key, state="cold")
+            log.info("Loaded %s version %s from %s", key, version or "unversioned", path)
+            self._loaded[key] = (token, obj)
+            return obj
+
+    def load(self, schema, role):
+        """Fitted estimator (``role`` "model" or "scaler") of a feature_schema bundle."""
+        default = schema.model_file if role == "model" else schema.scaler_file
+        return self.get(schema.name, role, lambda path: joblib.load(path, mmap_mode="r"), default)
+
+    def load_fast(self, schema):
+        """CompiledForest of the bundle's model: its .forest file mapped read-only, else compiled."""
+        from scripts.forest_engine import compiled_path, load_compiled
+
+        def load_forest(path):
+            # the pickle is only unpickled (and then shared with load()) when there is no .forest to map
+            model = None if os.path.exists(compiled_path(path)) else self.load(schema, "model")
+            return load_compiled(path, model, mmap_mode="r")
+
+        return self.get(schema.name, "model", load_forest, default=schema.model_file, verify=False,
+                        variant="compiled")
+
+    def resolve_dir(self, name):
+        """Directory of a registered model directory (transformers), or None if unregistered."""
+        entry = self.manifest()["models"].get(name)
+        return self.artifact(name, "model")[0] if entry else None
+
+    # ---------- registration ----------
+    def register(self, name, version, sources, activate=True):
+        """Copy ``sources`` ({role: path}) into the models dir as ``version`` of ``name``.
+
+        A model's first version is always made current; ``activate=False`` is
+        only for adding a version next to the one in use.
+        """
+        version = str(version)
+        data    = json.loads(json.dumps(self.manifest()))
+        if name not in data["models"]:
+            if not activate:
+                raise ValueError(f"{name} is not registered yet; its first version must be activated")
+            data["models"][name] = {"current": None, "versions": {}}
+        entry = data["models"][name]
+        if version in entry["versions"]:
+            raise ValueError(f"{name} version {version} already registered")
+
+        files = {}
+        for role, src in sources.items():
+            stem, ext = os.path.splitext(os.path.basename(os.path.normpath(src)))
+            rel  = f"{stem}@{version}{ext}"
+            dest = os.path.join(self.root, rel)
+            if os.path.isdir(src):
+                shutil.copytree(src, dest)
+            else:
+                shutil.copy2(src, dest)
+            files[role] = {"path": rel, "sha256": sha256_of(dest)}
+            compile_forest(dest)
+
+        entry["versions"][version] = {"created": _now(), "files": files}
+        if activate:
+            entry["current"] = version
+        self.write_manifest(data)
+        return entry
+
+    def activate(self, name, version):
+        data  = json.loads(json.dumps(self.manifest()))
+        entry = data["models"][name]
+        if str(version) not in entry["versions"]:
+            raise KeyError(f"{name} has no version {version}; known: {sorted(entry['versions'])}")
+        entry["current"] = str(version)
+        self.write_manifest(data)
+
+    def verify(self):
+        """(name, version, role, ok) for every registered file and directory."""
+        results = []
+        for name, entry in sorted(self.manifest()["models"].items()):
+            for version, meta in sorted(entry["versions"].items()):
+                for role, f in sorted(meta["files"].items()):
+                    path = os.path.join(self.root, f["path"])
+                    results.append((name, version, role, os.path.exists(path) and sha256_of(path) == f["sha256"]))
+        return results
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def compile_forest(pickle_path):
+    """Write the .forest next to a pickled random forest so it can be memory-mapped."""
+    if not pickle_path.endswith(".pkl"):
+        return
+    from scripts.forest_engine import CompiledForest, compiled_path
+
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+    model = joblib.load(pickle_path, mmap_mode="r")
+    if isinstance(model, (RandomForestClassifier, RandomForestRegressor)):
+        CompiledForest.from_sklearn(model).save(compiled_path(pickle_path))
+
+_registry      = None
+_registry_lock = threading.Lock()
+
+def registry():
+    """Process-wide registry over IIRA_MODELS_DIR (default: models/)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.root != models_dir():
+            _registry = ModelRegistry()
+        return _registry
+
+def load(schema, role):
+    return registry().load(schema, role)
+
+def load_fast(schema):
+    return registry().load_fast(schema)
+
+def current_version(name):
+    return registry().current_version(name)
+
+# ---------------------- CLI ----------------------
+def init_manifest(reg):
+    """Register the unversioned files already in the models dir as version 1."""
+    from scripts.feature_schema import CLAIM, FRAUD, RISK, SEGMENT
+
+    data = reg.manifest()
+    bundles = {s.name: {"model": s.model_file, "scaler": s.scaler_file} for s in (RISK, CLAIM, SEGMENT, FRAUD)}
+    # fraud's High_Claim median (scripts/fraud_detector.py), versioned with the model once saved
+    if os.path.exists(os.path.join(reg.root, "fraud_high_claim.json")):
+        bundles[FRAUD.name]["threshold"] = "fraud_high_claim.json"
+    bundles.update({name: {"model": name} for name in ("flan_t5_insurance", "saved_sentiment_cardiff")})
+    for name, roles in bundles.items():
+        if name in data["models"] or not all(os.path.exists(os.path.join(reg.root, p)) for p in roles.values()):
+            continue
+        files = {role: {"path": p, "sha256": sha256_of(os.path.join(reg.root, p))} for role, p in roles.items()}
+        data["models"][name] = {"current": "1", "versions": {"1": {"created": _now(), "files": files}}}
+        for p in roles.values():
+            compile_forest(os.path.join(reg.root, p))
+        print(f"Registered {name} version 1")
+    reg.write_manifest(data)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Versioned model registry")
+    sub    = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("init", help="manifest for the files already in the models dir")
+    sub.add_parser("list")
+    sub.add_parser("verify", help="re-hash every registered artifact")
+    reg_p = sub.add_parser("register", help="copy in a new version and make it current")
+    reg_p.add_argument("name")
+    reg_p.add_argument("version")
+    reg_p.add_argument("--model", required=True, help="pickle, or a transformers model directory")
+    reg_p.add_argument("--scaler")
+    reg_p.add_argument("--threshold", help="fraud_detector's High_Claim median JSON")
+    reg_p.add_argument("--no-activate", action="store_true")
+    act_p = sub.add_parser("activate", help="switch the current version (e.g. roll back)")
+    act_p.add_argument("name")
+    act_p.add_argument("version")
+    args = parser.parse_args(argv)
+
+    reg = registry()
+    if args.command == "init":
+        init_manifest(reg)
+    elif args.command == "register":
+        sources = {"model": args.model, **({"scaler": args.scaler} if args.scaler else {}),
+                   **({"threshold": args.threshold} if args.threshold else {})}
+        reg.register(args.name, args.version, sources, activate=not args.no_activate)
+        print(f"Registered {args.name} version {args.version}")
+    elif args.command == "activate":
+        reg.activate(args.name, args.version)
+        print(f"{args.name} now at version {args.version}")
+    elif args.command == "list":
+        for name, entry in sorted(reg.manifest()["models"].items()):
+            print(f"{name:<26} current={entry['current']:<6} versions={', '.join(sorted(entry['versions']))}")
+    elif args.command == "verify":
+        bad = 0
+        for name, version, role, ok in reg.verify():
+            print(f"{'ok  ' if ok else 'FAIL'} {name} v{version} {role}")
+            bad += not ok
+        raise SystemExit(1 if bad else 0)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
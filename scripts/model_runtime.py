@@ -0,0 +1,161 @@
+# scripts/model_runtime.py
+#
+# Shared loading layer for the transformer models (chatbot and sentiment).
+#
+# Configuration, all optional, read from the environment:
+#   IIRA_MODELS_DIR              directory holding flan_t5_insurance/, saved_sentiment_cardiff/ (default: <repo>/models)
+#   IIRA_QUANTIZE=1              dynamic int8 quantization of every nn.Linear after loading
+#   IIRA_TORCH_THREADS           intra-op threads (default: torch's choice)
+#   IIRA_TORCH_INTEROP_THREADS   inter-op threads (default: torch's choice)
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import torch
+
+from scripts.model_registry import models_dir, registry
+
+log = logging.getLogger(__name__)
+
+# where the models were trained and saved; still used if IIRA_MODELS_DIR and models/ lack them
+LEGACY_DIR = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\models"
+
+LATENCY_WINDOW = 1_000
+
+# ---------------------- Configuration ----------------------
+def resolve_model_dir(name):
+    """Current registered version of ``name``, else the first existing ``<dir>/<name>``
+    among IIRA_MODELS_DIR (or models/) and the legacy path."""
+    registered = registry().resolve_dir(name)
+    if registered is not None:
+        return registered
+    candidates = [os.path.join(models_dir(), name), os.path.join(LEGACY_DIR, name)]
+    for path in candidates:
+        if os.path.isdir(path):
+            return path
+    raise FileNotFoundError(f"Model {name!r} not found in {candidates}; set IIRA_MODELS_DIR")
+
+def quantize_enabled():
+    return os.environ.get("IIRA_QUANTIZE", "0") == "1"
+
+_threads_lock = threading.Lock()
+_threads_set  = False
+
+def configure_threads():
+    """Apply IIRA_TORCH_THREADS / IIRA_TORCH_INTEROP_THREADS once per process."""
+    global _threads_set
+    with _threads_lock:
+        if _threads_set:
+            return
+        _threads_set = True
+        if "IIRA_TORCH_THREADS" in os.environ:
+            torch.set_num_threads(int(os.environ["IIRA_TORCH_THREADS"]))
+        if "IIRA_TORCH_INTEROP_THREADS" in os.environ:
+            try:
+                torch.set_num_interop_threads(int(os.environ["IIRA_TORCH_INTEROP_THREADS"]))
+            except RuntimeError as e:
+                # only allowed before the first inter-op parallel work in the process
+                log.warning("Could not set inter-op threads: %s", e)
+
+def rss_bytes():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        import resource
+        # peak rather than current RSS, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# ---------------------- Statistics ----------------------
+class ModelStats:
+    """Load cost and a rolling window of call latencies for one model."""
+
+    def __init__(self, name, path):
+        self.name         = name
+        self.path         = path
+        self.load_seconds = None
+        self.rss_before   = None
+        self.rss_after    = None
+        self.quantized    = False
+        self.calls        = 0
+        self.latencies    = deque(maxlen=LATENCY_WINDOW)
+        self.lock         = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.calls += 1
+            self.latencies.append(seconds)
+
+    def summary(self):
+        with self.lock:
+            lat = np.asarray(self.latencies) * 1000
+        return {
+            "model": self.name,
+            "path": self.path,
+            "quantized": self.quantized,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "rss_mb": round(self.rss_after / 2**20, 1) if self.rss_after else None,
+            "load_rss_delta_mb": round((self.rss_after - self.rss_before) / 2**20, 1) if self.rss_after else None,
+            "threads": torch.get_num_threads(),
+            "calls": self.calls,
+            "p50_ms": round(float(np.percentile(lat, 50)), 2) if lat.size else None,
+            "p95_ms": round(float(np.percentile(lat, 95)), 2) if lat.size else None,
+        }
+
+STATS = {}
+
+def model_stats():
+    return [s.summary() for s in STATS.values()]
+
+class TimedCallable:
+    """Wraps a pipeline so every call is timed; attributes pass through (``.model``, ``.tokenizer``)."""
+
+    def __init__(self, fn, stats):
+        self._fn    = fn
+        self._stats = stats
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._fn(*args, **kwargs)
+        finally:
+            self._stats.record(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._fn, name)
+
+# ---------------------- Loading ----------------------
+def load_model(model_cls, name, quantize=None):
+    """``model_cls.from_pretrained`` on the resolved directory, in eval mode.
+
+    safetensors weights are preferred: they are memory-mapped rather than
+    unpickled into fresh buffers. With ``quantize`` (default IIRA_QUANTIZE)
+    every nn.Linear is replaced by a dynamic int8 version.
+    """
+    configure_threads()
+    path     = resolve_model_dir(name)
+    stats    = STATS[name] = ModelStats(name, path)
+    quantize = quantize_enabled() if quantize is None else quantize
+
+    stats.rss_before = rss_bytes()
+    start = time.perf_counter()
+    has_safetensors = any(f.endswith(".safetensors") for f in os.listdir(path))
+    model = model_cls.from_pretrained(path, use_safetensors=True if has_safetensors else None)
+    model.eval()
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        stats.quantized = True
+    stats.load_seconds = time.perf_counter() - start
+    stats.rss_after    = rss_bytes()
+
+    log.info("Loaded %s from %s in %.2fs (quantized=%s, +%.0f MB RSS)", name, path, stats.load_seconds,
+             stats.quantized, (stats.rss_after - stats.rss_before) / 2**20)
+    return model
+
+def timed(fn, name):
+    """Time every call of ``fn`` into the stats of the model loaded as ``name``."""
+    return TimedCallable(fn, STATS[name])
@@ -1,36 +1,174 @@
 # scripts/document_translator_app.py
 
 import os
-import pdfplumber
-import docx
+import logging
+import random
+import threading
 import time
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from deep_translator import GoogleTranslator
 
+from scripts.instrumentation import cached_resource, span
+from scripts.text_extraction import extract_text
+from scripts.translation_memory import CACHE_DIR, TranslationMemory, line_key, normalize
+
+log = logging.getLogger(__name__)
+
 # --------- Extract Text Functions ---------
+# Both go through scripts/text_extraction.py: each page is read once, large
+# PDFs are split across processes and results are cached by file content.
 def extract_text_from_pdf(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        return "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+    return extract_text(pdf_path)
 
 def extract_text_from_docx(docx_path):
-    doc = docx.Document(docx_path)
-    return "\n".join(para.text.strip() for para in doc.paragraphs if para.text.strip())
+    return extract_text(docx_path)
+
+# --------- Translator Backends ---------
+# A backend is anything with translate(text) -> str. Batches are sent as
+# newline-joined text, so a backend must keep one output line per input line.
+MAX_BATCH_CHARS = 4500   # GoogleTranslator rejects requests over 5000 characters
+MAX_WORKERS     = 8
+
+class GoogleBackend:
+    """GoogleTranslator per pool thread: it keeps the text being sent in instance state."""
+
+    def __init__(self, src_lang, dest_lang, timeout=5):
+        self.src_lang  = src_lang
+        self.dest_lang = dest_lang
+        self.timeout   = timeout
+        self._local    = threading.local()
+
+    def translate(self, text):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = self._local.translator = GoogleTranslator(source=self.src_lang, target=self.dest_lang,
+                                                                   timeout=self.timeout)
+        return translator.translate(text)
+
+class EchoBackend:
+    """Offline stand-in: tags each line with the target language after an optional simulated latency."""
+
+    def __init__(self, src_lang, dest_lang, latency=0.0):
+        self.dest_lang = dest_lang
+        self.latency   = latency
+
+    def translate(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return "\n".join(f"[{self.dest_lang}] {line}" for line in text.split("\n"))
+
+BACKENDS = {"google": GoogleBackend, "echo": EchoBackend}
+
+def default_backend_name():
+    return os.environ.get("IIRA_TRANSLATOR_BACKEND", "google")
+
+def get_backend(src_lang, dest_lang, name=None):
+    name = name or default_backend_name()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translator backend {name!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name](src_lang, dest_lang)
 
 # --------- Safe Translation Function ---------
-def translate_line_safe(line, translator, retries=3, delay=1):
+def call_with_backoff(fn, text, retries=3, delay=1):
+    """fn(text), retried with exponentially growing, jittered sleeps; re-raises the last error."""
     for attempt in range(retries):
         try:
-            return translator.translate(line)
+            return fn(text)
+        except Exception as e:
+            if attempt == retries - 1:
+                raise
+            log.warning("Retry %d for '%s...' -> %s", attempt + 1, text[:30], e)
+            time.sleep(delay * 2 ** attempt * random.uniform(0.5, 1.5))
+
+def translate_line_safe(line, translator, retries=3, delay=1):
+    """The translated line, or None once every retry failed."""
+    try:
+        return call_with_backoff(translator.translate, line, retries, delay)
+    except Exception as e:
+        log.warning("Giving up on line '%s...' -> %s", line[:30], e)
+        return None
+
+# --------- Batched, Concurrent Translation ---------
+def pack_batches(lines, max_chars=MAX_BATCH_CHARS):
+    """Split lines into consecutive batches whose newline-joined text fits in max_chars."""
+    batches, current, size = [], [], 0
+    for line in lines:
+        extra = len(line) + (1 if current else 0)
+        if current and size + extra > max_chars:
+            batches.append(current)
+            current, size, extra = [], 0, len(line)
+        current.append(line)
+        size += extra
+    if current:
+        batches.append(current)
+    return batches
+
+def translate_batch(batch, backend, retries=3, delay=1):
+    if len(batch) > 1:
+        try:
+            parts = call_with_backoff(backend.translate, "\n".join(batch), retries, delay).split("\n")
+            if len(parts) == len(batch):
+                return [p.strip() for p in parts]
+            log.warning("Batch of %d lines came back as %d; translating line by line", len(batch), len(parts))
         except Exception as e:
-            st.warning(f"⚠️ Retry {attempt+1} for line '{line[:30]}...' ➜ Error: {e}")
-            time.sleep(delay)
-    return line  # fallback
+            log.warning("Batch of %d lines failed (%s); translating line by line", len(batch), e)
+    return [translate_line_safe(line, backend, retries, delay) for line in batch]
+
+def translate_lines(lines, backend, max_workers=MAX_WORKERS, max_chars=MAX_BATCH_CHARS,
+                    retries=3, delay=1, progress=None):
+    """Translate lines in packed batches on a bounded thread pool, keeping their order.
+
+    Lines the backend could not translate come back as None.
+    ``progress(done_lines, total_lines)`` is called from the calling thread as
+    batches finish, so it can safely update Streamlit elements.
+    """
+    batches = pack_batches(lines, max_chars)
+    results = [None] * len(batches)
+    done    = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(translate_batch, b, backend, retries, delay): i for i, b in enumerate(batches)}
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            done += len(batches[i])
+            if progress:
+                progress(done, len(lines))
+    return [line for batch in results for line in batch]
+
+# --------- Translation Memory ---------
+@cached_resource("multilingual_translator.load_translation_memory")
+def load_translation_memory(backend_name):
+    # one memory per backend so stand-in output never leaks into real translations
+    return TranslationMemory(os.path.join(CACHE_DIR, f"translation_memory_{backend_name}.sqlite3"))
 
 # --------- Main Translation Pipeline ---------
-def translate_text(full_text, src_lang, dest_lang):
+def translate_text(full_text, src_lang, dest_lang, backend=None, progress=None, memory=None, stats=None):
+    """Translate every non-empty line, joined by blank lines.
+
+    Repeated lines are sent to the backend once. With a ``TranslationMemory``
+    only lines it has not seen for this language pair are sent, and the new
+    translations are stored. ``stats``, if given, is filled with per-document
+    line counts. Lines the backend failed on are kept in the source language
+    and are not stored, so they are retried next time.
+    """
     lines = [line.strip() for line in full_text.split("\n") if line.strip()]
-    translator = GoogleTranslator(source=src_lang, target=dest_lang, timeout=5)
-    translated_lines = [translate_line_safe(line, translator) for line in lines]
+    backend = backend or get_backend(src_lang, dest_lang)
+
+    keys   = [line_key(line) for line in lines]
+    unique = dict(zip(keys, lines))
+    known  = memory.lookup(src_lang, dest_lang, unique) if memory is not None else {}
+    todo   = [k for k in unique if k not in known]
+
+    translated = translate_lines([normalize(unique[k]) for k in todo], backend, progress=progress)
+    fresh      = {k: t for k, t in zip(todo, translated) if t is not None}
+    if memory is not None and fresh:
+        memory.store(src_lang, dest_lang, [(k, normalize(unique[k]), t) for k, t in fresh.items()])
+
+    if stats is not None:
+        stats.update(lines=len(lines), unique=len(unique), memory_hits=len(known), sent=len(todo),
+                     failed=len(todo) - len(fresh))
+    translated_lines = [known[k] if k in known else fresh.get(k, unique[k]) for k in keys]
     return "\n\n".join(translated_lines)
 
 # --------- Streamlit App ---------
@@ -51,23 +189,41 @@ def run():
             f.write(uploaded_file.getbuffer())
 
         # Extract text
-        if ext == ".pdf":
-            extracted_text = extract_text_from_pdf(temp_input_path)
-        elif ext == ".docx":
-            extracted_text = extract_text_from_docx(temp_input_path)
-        else:
-            st.error("❌ Unsupported file type!")
-            return
+        with span("multilingual_translator.extract"):
+            if ext == ".pdf":
+                extracted_text = extract_text_from_pdf(temp_input_path)
+            elif ext == ".docx":
+                extracted_text = extract_text_from_docx(temp_input_path)
+            else:
+                st.error("❌ Unsupported file type!")
+                return
 
         if not extracted_text:
             st.warning("⚠️ No text found in uploaded file.")
             return
 
         st.info("🔄 Translating... Please wait.")
+        bar = st.progress(0.0)
 
-        translated_text = translate_text(extracted_text, src_lang, dest_lang)
+        def show_progress(done, total):
+            bar.progress(done / total, text=f"Translated {done} of {total} lines")
+
+        memory = load_translation_memory(default_backend_name())
+        stats  = {}
+        with span("multilingual_translator.predict"):
+            translated_text = translate_text(extracted_text, src_lang, dest_lang, progress=show_progress,
+                                             memory=memory, stats=stats)
+        bar.progress(1.0, text=f"Translated {stats['lines']} lines")
 
         st.success("✅ Translation Completed!")
+        st.caption(
+            f"🧠 {stats['lines']} lines, {stats['unique']} unique: "
+            f"{stats['memory_hits']} from translation memory, {stats['sent']} sent to the translator "
+            f"(lifetime hit rate {memory.stats()['hit_rate']:.0%})"
+        )
+        if stats["failed"]:
+            st.warning(f"⚠️ {stats['failed']} line(s) could not be translated and were left as is; "
+                       f"translating again retries them.")
         st.download_button(
             label="📥 Download Translated Text",
             data=translated_text,
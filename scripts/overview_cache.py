@@ -0,0 +1,137 @@
+# scripts/overview_cache.py
+
+import io
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from wordcloud import WordCloud
+
+from scripts import datasets
+from scripts.instrumentation import cached_data
+from scripts.review_index import ReviewWordIndex
+
+BASE     = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(BASE, "Dataset")
+
+SOURCES = {
+    "FD":  datasets.FD.file,
+    "CFS": datasets.CFS.file,
+    "CS":  datasets.CS.file,
+    "RC":  datasets.RC.file,
+}
+
+SENTIMENT_COLORMAPS = {"Positive": "Greens", "Negative": "Reds", "Neutral": "Greys"}
+
+# ---------------------- Fingerprint ----------------------
+def fingerprint(data_dir=DATA_DIR):
+    """{name: (path, mtime_ns, size)} per source file; any change invalidates that section."""
+    fp = {}
+    for name, fname in SOURCES.items():
+        path = os.path.join(data_dir, fname)
+        try:
+            info = os.stat(path)
+            fp[name] = (path, info.st_mtime_ns, info.st_size)
+        except FileNotFoundError:
+            fp[name] = (path, None, None)
+    return fp
+
+# ---------------------- Rendering ----------------------
+def fig_to_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=100)
+    plt.close(fig)
+    return buf.getvalue()
+
+def render_wordcloud(frequencies, colormap):
+    if not frequencies:
+        return None
+    wc = WordCloud(width=400, height=200, background_color="white", colormap=colormap).generate_from_frequencies(frequencies)
+    fig, ax = plt.subplots(figsize=(4,2))
+    ax.imshow(wc, interpolation="bilinear")
+    ax.axis("off")
+    return fig_to_png(fig)
+
+def render_stacked_bar(table, title):
+    fig, ax = plt.subplots(figsize=(5, 3))
+    table.plot(kind="bar", stacked=True, ax=ax)
+    ax.set_ylabel("Number of Policies")
+    ax.set_title(title)
+    return fig_to_png(fig)
+
+# ---------------------- Precomputation ----------------------
+# One cached builder per source file, each keyed by that file's fingerprint,
+# so touching one CSV only rebuilds the charts that depend on it. Each reads
+# only the columns it charts, typed, from the file's Parquet copy.
+
+@cached_data("overview.metrics", persist="disk", max_entries=2, show_spinner=False)
+def build_metrics(fp):
+    path, _, _ = fp
+    FD_df = datasets.read(path, datasets.FD, columns=["Policyholder_ID", "Claim_Amount", "Fraud_Label"])
+    return {
+        "policyholders": int(FD_df["Policyholder_ID"].nunique()),
+        "claims":        int(FD_df.shape[0]),
+        "claim_amount":  int(FD_df["Claim_Amount"].sum()),
+        "fraud_percent": float(FD_df["Fraud_Label"].sum() / FD_df.shape[0] * 100),
+    }
+
+@cached_data("overview.wordclouds", persist="disk", max_entries=2, show_spinner=False)
+def build_wordclouds(fp):
+    # token counts are maintained incrementally; only appended reviews are tokenized
+    path, _, _ = fp
+    index = ReviewWordIndex(path)
+    index.update()
+    return {
+        f"wordcloud_{label}": render_wordcloud(index.frequencies(label), cmap)
+        for label, cmap in SENTIMENT_COLORMAPS.items()
+    }
+
+def read_present(path, dataset, columns):
+    """``columns`` of ``path`` that the file actually has; the charts skip the rest."""
+    present = datasets.column_names(path, dataset)
+    return datasets.read(path, dataset, columns=[c for c in columns if c in present])
+
+@cached_data("overview.risk_charts", persist="disk", max_entries=2, show_spinner=False)
+def build_risk_charts(fp):
+    path, _, _ = fp
+    RC_df = read_present(path, datasets.RC, ["Policy_Type", "Risk_Score"])
+    tables, images = {}, {}
+    if "Policy_Type" in RC_df.columns and "Risk_Score" in RC_df.columns:
+        tables["risk_policy"] = RC_df.groupby(["Policy_Type", "Risk_Score"], observed=True).size().unstack(fill_value=0)
+        images["risk_policy"] = render_stacked_bar(tables["risk_policy"], "Risk Distribution")
+    return tables, images
+
+@cached_data("overview.segment_charts", persist="disk", max_entries=2, show_spinner=False)
+def build_segment_charts(fp):
+    path, _, _ = fp
+    CS_df = read_present(path, datasets.CS, ["Location", "Occupation", "Policy Type"])
+    tables, images = {}, {}
+    if "Policy Type" in CS_df.columns and "Location" in CS_df.columns:
+        tables["policy_location"] = CS_df.groupby(["Location", "Policy Type"], observed=True).size().unstack(fill_value=0)
+        images["policy_location"] = render_stacked_bar(tables["policy_location"], "Policy vs Location")
+    if "Policy Type" in CS_df.columns and "Occupation" in CS_df.columns:
+        tables["policy_occupation"] = CS_df.groupby(["Occupation", "Policy Type"], observed=True).size().unstack(fill_value=0)
+        images["policy_occupation"] = render_stacked_bar(tables["policy_occupation"], "Policy vs Occupation")
+    return tables, images
+
+def load_overview(data_dir=DATA_DIR):
+    """KPI metrics, chart tables and rendered PNGs for the Overview page.
+
+    Costs a few stat() calls when nothing changed; a section is rebuilt only
+    when its source file's mtime or size changes.
+    """
+    fp     = fingerprint(data_dir)
+    exists = {name: entry[1] is not None for name, entry in fp.items()}
+    result = {"metrics": None, "tables": {}, "images": {}}
+
+    if exists["FD"]:
+        result["metrics"] = build_metrics(fp["FD"])
+    if exists["CFS"]:
+        result["images"].update(build_wordclouds(fp["CFS"]))
+    for name, builder in (("RC", build_risk_charts), ("CS", build_segment_charts)):
+        if exists[name]:
+            tables, images = builder(fp[name])
+            result["tables"].update(tables)
+            result["images"].update(images)
+    return result
@@ -0,0 +1,144 @@
+# scripts/review_index.py
+
+import hashlib
+import io
+import json
+import os
+import re
+from collections import Counter
+
+import pandas as pd
+from wordcloud import STOPWORDS
+
+BASE      = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.path.join(BASE, ".cache")
+
+TOKEN_RE  = re.compile(r"\w[\w']*")
+BLOCK     = 1 << 20
+
+def tokenize(texts):
+    """Lower-cased word tokens with WordCloud's stopwords, numbers and possessives removed."""
+    tokens = texts.str.lower().str.findall(TOKEN_RE).explode().dropna()
+    tokens = tokens.str.replace(r"'s$", "", regex=True)
+    keep   = (tokens.str.len() > 1) & ~tokens.str.isdigit() & ~tokens.isin(STOPWORDS)
+    return tokens[keep]
+
+class ReviewWordIndex:
+    """Per-label token frequencies over a reviews CSV, maintained incrementally.
+
+    The index remembers how many bytes of the source file it has consumed,
+    the header, a hash of the last BLOCK consumed bytes and the file's mtime
+    and size. ``update()`` returns at once when mtime and size are unchanged
+    and otherwise tokenizes only the rows appended since the last call, so an
+    append costs I/O proportional to the new rows, not to the file. If the
+    file shrank or its header or last consumed block changed, it was not a
+    pure append and the index is rebuilt from scratch. (An edit further back
+    that keeps those intact goes unnoticed; delete the index file to force
+    a rebuild.)
+    """
+
+    def __init__(self, source_path, label_col="Sentiment_Label", text_col="Review_Text", index_path=None):
+        self.source_path = source_path
+        self.label_col   = label_col
+        self.text_col    = text_col
+        self.index_path  = index_path or os.path.join(
+            CACHE_DIR, f"wordindex_{os.path.splitext(os.path.basename(source_path))[0]}.json"
+        )
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.counts    = {}
+        self.offset    = 0
+        self.rows      = 0
+        self.header      = b""
+        self.tail_hash   = hashlib.sha1().hexdigest()
+        self.mtime_ns    = None
+        self.size        = None
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if "tail_hash" not in state:
+            return  # written by an older version; rebuild
+        self.counts      = {label: Counter(c) for label, c in state["counts"].items()}
+        self.offset      = state["offset"]
+        self.rows        = state["rows"]
+        self.header      = state["header"].encode("utf-8")
+        self.tail_hash   = state["tail_hash"]
+        self.mtime_ns    = state["mtime_ns"]
+        self.size        = state["size"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "counts": {label: dict(c) for label, c in self.counts.items()},
+                "offset": self.offset,
+                "rows": self.rows,
+                "header": self.header.decode("utf-8"),
+                "tail_hash": self.tail_hash,
+                "mtime_ns": self.mtime_ns,
+                "size": self.size,
+            }, f)
+        os.replace(tmp, self.index_path)
+
+    def _tail_digest(self, f, end):
+        """sha1 of the BLOCK bytes of ``f`` before ``end`` (fewer near the start)."""
+        start = max(0, end - BLOCK)
+        f.seek(start)
+        return hashlib.sha1(f.read(end - start)).hexdigest()
+
+    def _appended(self, f, size):
+        """True if the consumed bytes still end the same way, i.e. the file only grew."""
+        if size < self.offset:
+            return False
+        f.seek(0)
+        return f.read(len(self.header)) == self.header and self._tail_digest(f, self.offset) == self.tail_hash
+
+    def update(self):
+        """Index rows appended since the last call; returns the number of new rows."""
+        st = os.stat(self.source_path)
+        if (st.st_mtime_ns, st.st_size) == (self.mtime_ns, self.size):
+            return 0
+
+        with open(self.source_path, "rb") as f:
+            if not self._appended(f, st.st_size):
+                # an edit, truncation or rewrite rather than an append
+                self._reset()
+
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+            if self.offset == 0 and data:
+                header_end  = data.index(b"\n") + 1
+                self.header = data[:header_end]
+                data        = data[header_end:]
+                self.offset = header_end
+            # leave a partially written last line for the next update
+            complete = data.rfind(b"\n") + 1
+            data     = data[:complete]
+            tail     = self._tail_digest(f, self.offset + complete)
+
+        new_rows = 0
+        if data:
+            chunk = pd.read_csv(io.BytesIO(self.header + data), usecols=[self.label_col, self.text_col])
+            chunk = chunk.dropna(subset=[self.text_col])
+            tokens = tokenize(chunk[self.text_col])
+            labels = chunk[self.label_col].reindex(tokens.index)
+            for (label, word), n in pd.DataFrame({"label": labels, "word": tokens}).value_counts().items():
+                self.counts.setdefault(label, Counter())[word] += int(n)
+            new_rows = len(chunk)
+
+        self.offset     += complete
+        self.rows       += new_rows
+        self.tail_hash   = tail
+        self.mtime_ns, self.size = st.st_mtime_ns, st.st_size
+        self.save()
+        return new_rows
+
+    def frequencies(self, label, max_words=200):
+        return dict(self.counts.get(label, Counter()).most_common(max_words))
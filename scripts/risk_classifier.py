@@ -1,32 +1,136 @@
 # scripts/risk_classifier.py
 
 import os
-import joblib
+import tempfile
 import numpy as np
 import pandas as pd
 import streamlit as st
 
-@st.cache_resource
+from scripts import datasets, model_registry
+from scripts.feature_schema import RISK as SCHEMA
+from scripts.instrumentation import span
+
+RISK_LABELS      = {0:"Low", 1:"Medium", 2:"High"}
+BATCH_CHUNK_SIZE = 50_000
+TOP_FACTORS      = 3
+
 def load_artifacts():
-    # Compute project root (parent of scripts/)
-    BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    # Build absolute paths into models/
-    model_path  = os.path.join(BASE, "models", "risk_classification_rfc.pkl")
-    scaler_path = os.path.join(BASE, "models", "scaler_rc.pkl")
-    # Debug: verify paths
-    print("Loading RFC from:", model_path)
-    print("Loading scaler from:", scaler_path)
-    # Load
-    model  = joblib.load(model_path)
-    scaler = joblib.load(scaler_path)
+    # current version from models/manifest.json (see scripts/model_registry.py)
+    model  = model_registry.load(SCHEMA, "model")
+    scaler = model_registry.load(SCHEMA, "scaler")
+    SCHEMA.check(scaler, model)
     return model, scaler
 
+def load_fast_model():
+    # Array-compiled copy of the forest for single-row latency; maps
+    # models/<model>.forest when present (see scripts/forest_engine.py)
+    return model_registry.load_fast(SCHEMA)
+
+# ---------------------- Explanations ----------------------
+def explain(forest, Xs):
+    """Class probabilities, base value and per-column contributions for every row.
+
+    Path decomposition over the compiled forest (``CompiledForest.contributions``).
+    Contributions are towards each row's predicted class, with one-hot groups
+    (Gender_*, Policy_Type_*) summed into their input column, so for every
+    row ``base + contributions.sum()`` is the predicted class's probability.
+    """
+    bias, contrib = forest.contributions(Xs)
+    proba = np.clip(bias + contrib.sum(axis=1), 0.0, 1.0)  # float noise around 0 and 1
+    pred  = proba.argmax(axis=1)
+    own   = np.take_along_axis(contrib, pred[:, None, None], axis=2)[:, :, 0]
+    return proba, bias[pred], own @ SCHEMA.column_groups()
+
+def top_factors(contrib, k=TOP_FACTORS):
+    """The ``k`` columns pushing hardest towards each row's predicted class, as text."""
+    names = np.asarray(SCHEMA.columns)
+    top   = np.argsort(-contrib, axis=1)[:, :k]
+    vals  = np.take_along_axis(contrib, top, axis=1)
+    return [
+        ", ".join(f"{name} {v:+.3f}" for name, v in zip(row_names, row_vals) if v > 0)
+        for row_names, row_vals in zip(names[top], vals)
+    ]
+
+# ---------------------- Batch Scoring ----------------------
+def score_chunks(source, model, scaler, chunksize=BATCH_CHUNK_SIZE, explain_with=None):
+    """Yield labelled chunks of ``source`` (a CSV/Parquet path or file-like object).
+
+    Paths are read through the typed Parquet cache (scripts/datasets.py).
+    Only one chunk is held in memory at a time, and each chunk goes through
+    ``scaler.transform`` and ``model.predict_proba`` in a single call. With
+    ``explain_with`` (the compiled forest) the probabilities come from its
+    path decomposition instead, and every row also gets ``Contrib_<column>``
+    values, the base value and its top factors.
+    """
+    labels = np.array([RISK_LABELS[c] for c in model.classes_])
+    for chunk in datasets.iter_chunks(source, datasets.RC, chunksize):
+        with span("risk_classifier.batch_features"):
+            Xs = scaler.transform(SCHEMA.transform(chunk))
+        if explain_with is None:
+            with span("risk_classifier.batch_predict"):
+                proba = model.predict_proba(Xs)
+        else:
+            with span("risk_classifier.batch_explain"):
+                proba, base, contrib = explain(explain_with, Xs)
+
+        chunk["Predicted_Risk"] = labels[proba.argmax(axis=1)]
+        for i, label in enumerate(labels):
+            chunk[f"P_{label}"] = proba[:, i]
+        if explain_with is not None:
+            chunk["Contrib_Base"] = base
+            for j, column in enumerate(SCHEMA.columns):
+                chunk[f"Contrib_{column}"] = contrib[:, j]
+            chunk["Top_Factors"] = top_factors(contrib)
+        yield chunk
+
+def run_batch(model, scaler):
+    st.markdown("Score a whole `Insurance_RC_CP.csv`-shaped file in chunks.")
+
+    uploaded_file = st.file_uploader("📂 Upload a CSV", type=["csv"])
+    file_path     = st.text_input("…or a CSV path on the server", "")
+    fmt           = st.radio("Output format", ["csv", "parquet"], horizontal=True)
+    chunksize     = st.number_input("Chunk size (rows)", 1_000, 1_000_000, BATCH_CHUNK_SIZE, step=1_000)
+    explain_rows  = st.checkbox("Include per-feature explanations (Contrib_* columns and top factors)")
+
+    source = uploaded_file if uploaded_file is not None else file_path.strip()
+    if st.button("Score File"):
+        if not source:
+            st.warning("⚠️ Please upload a CSV or enter a file path.")
+            return
+        if isinstance(source, str) and not os.path.exists(source):
+            st.error(f"❌ File not found: {source}")
+            return
+
+        fd, output_path = tempfile.mkstemp(suffix=f".{fmt}")
+        os.close(fd)
+        with st.spinner("🔄 Scoring in chunks..."):
+            explainer = load_fast_model() if explain_rows else None
+            rows = datasets.write_scored(score_chunks(source, model, scaler, int(chunksize), explainer), output_path, fmt)
+
+        st.success(f"✅ Scored {rows:,} policies.")
+        with open(output_path, "rb") as f:
+            st.download_button(
+                label="📥 Download Scored File",
+                data=f,
+                file_name=f"risk_scored.{fmt}",
+                mime="text/csv" if fmt == "csv" else "application/octet-stream",
+            )
+        os.remove(output_path)
+
 def run():
     st.header("📈 Risk Classification (Low / Medium / High)")
 
     # load model & scaler
     model, scaler = load_artifacts()
 
+    single_tab, batch_tab = st.tabs(["Single Policy", "Batch Scoring"])
+    with batch_tab:
+        run_batch(model, scaler)
+
+    with single_tab:
+        run_single(load_fast_model(), scaler)
+
+def run_single(model, scaler):
     # ——— Inputs ———
     customer_age     = st.number_input("Customer Age", 18, 100, 30)
     annual_income    = st.number_input("Annual Income", 0.0, 1e7, 500000.0)
@@ -40,38 +144,39 @@ def run():
     claim_to_income  = st.number_input("Claim to Income Ratio", 0.0, 10.0, 0.05, step=0.01)
     age_risk_factor  = st.number_input("Age Risk Factor", 0.0, 5.0, 1.0, step=0.1)
 
-    # ——— Encode & one-hot ———
-    risk_map    = {"Low":0, "Medium":1, "High":2}
-    fraud_map   = {"No":0, "Yes":1}
-    genders     = ["Male","Female"]
-    policies    = ["Health","Auto","Life","Property"]
-
-    fc = fraud_map[fraudulent_claim]
-    gender_ohe = [1 if gender==g else 0 for g in genders]
-    policy_ohe = [1 if policy_type==p else 0 for p in policies]
-
-    # ——— Assemble in exact order ———
-    X = np.array([[
-        customer_age,
-        annual_income,
-        property_age,
-        claim_history,
-        premium_amount,
-        claim_amount,
-        fc
-    ] + gender_ohe + policy_ohe + [
-        claim_to_income,
-        age_risk_factor
-    ]], dtype=float)
+    # ——— Encode in exact training order (see feature_schema.RISK) ———
+    with span("risk_classifier.features"):
+        X = SCHEMA.transform({
+            "Customer_Age":     customer_age,
+            "Annual_Income":    annual_income,
+            "Property_Age":     property_age,
+            "Claim_History":    claim_history,
+            "Premium_Amount":   premium_amount,
+            "Claim_Amount":     claim_amount,
+            "Fraudulent_Claim": fraudulent_claim,
+            "Gender":           gender,
+            "Policy_Type":      policy_type,
+            "Claim_to_Income":  claim_to_income,
+            "Age_Risk_Factor":  age_risk_factor,
+        })
 
     # ——— Predict & display ———
     if st.button("Predict Risk Category"):
-        Xs       = scaler.transform(X)
-        pred_num = model.predict(Xs)[0]
-        proba    = model.predict_proba(Xs)[0]
+        with span("risk_classifier.predict"):
+            Xs       = scaler.transform(X)
+            proba    = model.predict_proba(Xs)[0]
+            pred_num = model.classes_[proba.argmax()]
         inv_map  = {0:"Low",1:"Medium",2:"High"}
         pred_lbl = inv_map[pred_num]
 
-        st.markdown(f"### 🔮 Predicted Risk Category: **{pred_lbl}**")
-        st.markdown("#### Class Probabilities:")
-        st.dataframe(pd.DataFrame([proba], columns=[inv_map[i] for i in range(len(proba))]))
+        with span("risk_classifier.explain"):
+            _, base, contrib = explain(model, Xs)
+
+        with span("risk_classifier.render"):
+            st.markdown(f"### 🔮 Predicted Risk Category: **{pred_lbl}**")
+            st.markdown("#### Class Probabilities:")
+            st.dataframe(pd.DataFrame([proba], columns=[inv_map[i] for i in range(len(proba))]))
+
+            st.markdown(f"#### Why {pred_lbl}?")
+            st.caption(f"Contribution of each input to P({pred_lbl}), starting from the base rate {base[0]:.3f}.")
+            st.bar_chart(pd.Series(contrib[0], index=SCHEMA.columns, name="Contribution"), horizontal=True)
@@ -0,0 +1,355 @@
+# scripts/scoring_service.py
+#
+# Headless JSON scoring API for the four tabular models.
+#
+#   python -m scripts.scoring_service --port 8600
+#
+#   POST /predict/risk      {"Customer_Age": 42, "Gender": "Male", ...}  or a list of such objects
+#   POST /predict/claim
+#   POST /predict/segment
+#   POST /predict/fraud
+#   GET  /stats             queue depth and batch-size statistics per model
+#   GET  /metrics           Prometheus text format (spans and counters need IIRA_METRICS=1)
+#   GET  /health
+#
+# Records use the dataset column names declared in scripts/feature_schema.py.
+# Requests that arrive within --max-wait-ms of each other are coalesced into a
+# single scaler.transform / predict call per model.
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import Counter
+
+from scripts import claim_predictor, customer_segmentation, fraud_detector, instrumentation, risk_classifier
+from scripts.feature_schema import Numeric
+from scripts.forest_engine import BULK_ROWS
+
+log = logging.getLogger("scoring_service")
+
+MAX_BATCH   = 256
+MAX_WAIT_MS = 5.0
+MAX_BODY    = 10 * 1024 * 1024
+BUCKETS     = (1, 4, 16, 64, 256)
+
+# ---------------------- Scoring Functions ----------------------
+# Each takes a list of records and returns one JSON-serialisable result per record.
+# The forests use their compiled copy up to BULK_ROWS records, sklearn above it.
+
+def score_risk(records):
+    model, scaler = risk_classifier.load_artifacts()
+    if len(records) <= BULK_ROWS:
+        model = risk_classifier.load_fast_model()
+    X         = risk_classifier.SCHEMA.transform(records)
+    proba     = model.predict_proba(scaler.transform(X))
+    labels    = [risk_classifier.RISK_LABELS[c] for c in model.classes_]
+    return [
+        {"risk": labels[p.argmax()], "probabilities": dict(zip(labels, p.round(6).tolist()))}
+        for p in proba
+    ]
+
+def score_claim(records):
+    model, scaler = claim_predictor.load_artifacts()
+    if len(records) <= BULK_ROWS:
+        model = claim_predictor.load_fast_model()
+    X         = claim_predictor.SCHEMA.transform(records)
+    preds     = model.predict(scaler.transform(X))
+    return [{"claim_amount": round(float(p), 2)} for p in preds]
+
+def score_segment(records):
+    scaler, kmeans = customer_segmentation.load_artifacts()
+    Xs        = scaler.transform(customer_segmentation.SCHEMA.transform(records))
+    distances = kmeans.transform(Xs)
+    clusters  = distances.argmin(axis=1)
+    return [
+        {
+            "cluster": int(c),
+            "segment": customer_segmentation.CLUSTER_LABELS.get(int(c), f"Cluster {c}"),
+            "distances": d.round(4).tolist(),
+        }
+        for c, d in zip(clusters, distances)
+    ]
+
+def score_fraud(records):
+    model, scaler = fraud_detector.load_artifacts()
+    threshold     = fraud_detector.high_claim_threshold()
+    records = [
+        r if "High_Claim" in r else {**r, "High_Claim": int(float(r["Claim_Amount"]) > threshold)}
+        for r in records
+    ]
+    preds = model.predict(scaler.transform(fraud_detector.SCHEMA.transform(records)))
+    return [{"prediction": "Fraud" if p == -1 else "Normal"} for p in preds]
+
+SCORERS = {
+    "risk":    score_risk,
+    "claim":   score_claim,
+    "segment": score_segment,
+    "fraud":   score_fraud,
+}
+
+MODULES = {
+    "risk":    risk_classifier,
+    "claim":   claim_predictor,
+    "segment": customer_segmentation,
+    "fraud":   fraud_detector,
+}
+
+# ---------------------- Validation ----------------------
+def check_records(name, records):
+    """Raise ValueError unless every numeric field present in ``records`` is a finite JSON number.
+
+    Runs before a request is queued, so a null or a string where a number
+    belongs is a 400 for that request rather than an error inside the batch.
+    Missing columns are left to ``SCHEMA.transform`` (KeyError, also a 400).
+    """
+    numeric = [f.column for f in MODULES[name].SCHEMA.features if isinstance(f, Numeric)]
+    for i, record in enumerate(records):
+        for column in numeric:
+            value = record.get(column, 0)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"record {i}: {column!r} must be a finite number, got {json.dumps(value)}")
+
+# ---------------------- Micro-Batching ----------------------
+class MicroBatcher:
+    """Coalesce concurrent requests for one model into a single vectorized call.
+
+    The worker takes the first queued request, keeps collecting for up to
+    ``max_wait`` seconds or ``max_batch`` records, scores everything in one
+    executor call and hands each request its slice of the results. If that
+    call fails, each request is rescored on its own, so only the request with
+    the bad record gets the error.
+    """
+
+    def __init__(self, name, score_fn, max_batch=MAX_BATCH, max_wait=MAX_WAIT_MS / 1000):
+        self.name      = name
+        self.score_fn  = score_fn
+        self.max_batch = max_batch
+        self.max_wait  = max_wait
+        self.queue     = asyncio.Queue()
+        self.requests  = 0
+        self.rows      = 0
+        self.batches   = 0
+        self.errors    = 0
+        self.max_seen  = 0
+        self.sizes     = Counter()
+        self.last_ms   = 0.0
+
+    async def submit(self, records):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            rows    = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                rows += len(item[0])
+
+            records = [r for recs, _ in pending for r in recs]
+            start   = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, records)
+            except Exception as e:
+                self._observe(start, error=True)
+                if len(pending) == 1:
+                    self._fail(pending[0][1], e)
+                else:
+                    # one bad record must not fail the requests it was coalesced with
+                    await self._score_each(loop, pending)
+                continue
+            self._observe(start)
+
+            self._record(len(pending), rows)
+            instrumentation.count("iira_scored_rows_total", rows, model=self.name)
+            offset = 0
+            for recs, future in pending:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(recs)])
+                offset += len(recs)
+
+    async def _score_each(self, loop, pending):
+        for recs, future in pending:
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, recs)
+            except Exception as e:
+                self._observe(start, error=True)
+                self._fail(future, e)
+                continue
+            self._observe(start)
+            self._record(1, len(recs))
+            instrumentation.count("iira_scored_rows_total", len(recs), model=self.name)
+            if not future.done():
+                future.set_result(results)
+
+    def _observe(self, start, error=False):
+        elapsed      = time.perf_counter() - start
+        self.last_ms = elapsed * 1000
+        instrumentation.observe(f"scoring_service.{self.name}.batch", elapsed, error=error)
+
+    def _fail(self, future, error):
+        self.errors += 1
+        if not future.done():
+            future.set_exception(error)
+
+    def _record(self, n_requests, n_rows):
+        self.requests += n_requests
+        self.rows     += n_rows
+        self.batches  += 1
+        self.max_seen  = max(self.max_seen, n_rows)
+        bucket = next((b for b in BUCKETS if n_rows <= b), f">{BUCKETS[-1]}")
+        self.sizes[str(bucket)] += 1
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_seen,
+            "batch_size_histogram": dict(self.sizes),
+            "last_batch_ms": round(self.last_ms, 3),
+        }
+
+# ---------------------- HTTP ----------------------
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+class ScoringServer:
+    def __init__(self, batchers):
+        self.batchers = batchers
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, {name: b.stats() for name, b in self.batchers.items()}
+        if path == "/metrics":
+            return 200, instrumentation.prometheus_text()
+        if not path.startswith("/predict/"):
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        batcher = self.batchers.get(path[len("/predict/"):])
+        if batcher is None:
+            return 404, {"error": f"unknown model, expected one of {sorted(self.batchers)}"}
+        try:
+            data = json.loads(body or b"null")
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+
+        single  = isinstance(data, dict)
+        records = [data] if single else data
+        if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+            return 400, {"error": "body must be a JSON object or a non-empty list of objects"}
+
+        try:
+            check_records(batcher.name, records)
+            results = await batcher.submit(records)
+        except (KeyError, ValueError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            log.exception("scoring failed")
+            return 500, {"error": str(e)}
+        return 200, results[0] if single else results
+
+    async def respond(self, writer, status, payload, keep_alive=True):
+        # plain strings are the /metrics exposition text; everything else is JSON
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(host, port, max_batch, max_wait_ms):
+    # load every artifact up front so the first request isn't a cold start
+    for name, module in MODULES.items():
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _warm, module)
+        except Exception as e:
+            log.warning("Could not pre-load %s model: %s", name, e)
+
+    batchers = {name: MicroBatcher(name, fn, max_batch, max_wait_ms / 1000) for name, fn in SCORERS.items()}
+    workers  = [asyncio.create_task(b.worker()) for b in batchers.values()]
+    server   = await asyncio.start_server(ScoringServer(batchers).handle, host, port)
+    log.info("Scoring service listening on http://%s:%d", host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for w in workers:
+            w.cancel()
+
+def _warm(module):
+    # artifacts are cached by the modules' own loaders
+    module.load_artifacts()
+    if hasattr(module, "load_fast_model"):
+        module.load_fast_model()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching scoring API for the tabular models")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms))
@@ -3,12 +3,20 @@
 import streamlit as st
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
 
-@st.cache_resource
+from scripts import model_registry, model_runtime
+from scripts.instrumentation import cached_resource, span
+
 def load_sentiment_model():
-    model_path = r"C:\Users\Hxtreme\Jupyter_Notebook_Learning\Final_Project\models\saved_sentiment_cardiff"
+    # keyed by the registered version, so activating a new one reloads without a restart
+    return _load_sentiment_model(model_registry.current_version("saved_sentiment_cardiff"))
+
+@cached_resource("sentiment_predictor.load_sentiment_model", max_entries=1)
+def _load_sentiment_model(version):
+    # models/saved_sentiment_cardiff unless IIRA_MODELS_DIR says otherwise (see scripts/model_runtime.py)
+    model_path = model_runtime.resolve_model_dir("saved_sentiment_cardiff")
     tokenizer = AutoTokenizer.from_pretrained(model_path)
-    model = AutoModelForSequenceClassification.from_pretrained(model_path)
-    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+    model = model_runtime.load_model(AutoModelForSequenceClassification, "saved_sentiment_cardiff")
+    return model_runtime.timed(pipeline("sentiment-analysis", model=model, tokenizer=tokenizer), "saved_sentiment_cardiff")
 
 def map_label(label):
     label_map = {0: "negative", 1: "neutral", 2: "positive"}
@@ -27,7 +35,8 @@ def run():
         if user_input.strip() == "":
             st.warning("⚠️ Please enter some feedback text to analyze.")
         else:
-            result = sentiment_pipeline(user_input)[0]
+            with span("sentiment_predictor.predict"):
+                result = sentiment_pipeline(user_input)[0]
             sentiment = map_label(result['label'])
             confidence = result['score']
 
@@ -1,34 +1,31 @@
 # scripts/policy_summarizer.py
 
 import os
-import pdfplumber
 from docx import Document
 import spacy
 import numpy as np
 import streamlit as st
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from scripts import text_extraction
+from scripts.instrumentation import cached_resource, span
 
 # ---------------------- Text Extraction ----------------------
+# Shared with the translator: pages are extracted once and cached by content hash
 def extract_text(file_path):
-    if file_path.endswith(".pdf"):
-        with pdfplumber.open(file_path) as pdf:
-            return "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-    elif file_path.endswith(".docx"):
-        doc = Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-    else:
-        raise ValueError("❌ Unsupported file type. Only PDF or DOCX allowed.")
+    return text_extraction.extract_text(file_path)
 
 # ---------------------- Summarization ----------------------
-@st.cache_resource
+@cached_resource("summarizer.load_spacy_model")
 def load_spacy_model():
     return spacy.load("en_core_web_sm")
 
-nlp = load_spacy_model()
-
 def spacy_extractive_summary(text, num_sentences=7):
-    doc = nlp(text)
+    nlp = load_spacy_model()
+    return summarize_doc(nlp(text), num_sentences)
+
+def summarize_doc(doc, num_sentences=7):
+    """Extractive summary of an already processed spaCy Doc (needs sentence boundaries only)."""
     sentences = [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 20]
 
     if len(sentences) <= num_sentences:
@@ -36,12 +33,26 @@ def spacy_extractive_summary(text, num_sentences=7):
 
     tfidf = TfidfVectorizer(stop_words='english')
     tfidf_matrix = tfidf.fit_transform(sentences)
-    similarity_matrix = cosine_similarity(tfidf_matrix)
 
-    sentence_scores = similarity_matrix.sum(axis=1)
-    ranked_sentences = [sentences[i] for i in np.argsort(-sentence_scores)[:num_sentences]]
+    sentence_scores = score_sentences(tfidf_matrix)
+    selected = select_sentences(sentence_scores, num_sentences)
+
+    return "\n".join(sentences[i] for i in selected)
+
+def score_sentences(tfidf_matrix):
+    """Each sentence's summed cosine similarity to all sentences, in O(nnz).
+
+    TfidfVectorizer L2-normalises its rows, so row i of
+    cosine_similarity(X).sum(axis=1) equals x_i . sum_j x_j: one sparse
+    matrix-vector product instead of a dense n x n similarity matrix.
+    """
+    centroid = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+    return tfidf_matrix @ centroid
 
-    return "\n".join(ranked_sentences)
+def select_sentences(scores, num_sentences):
+    """Indices of the top-scoring sentences in document order; ties keep the earlier sentence."""
+    top = np.argsort(-scores, kind="stable")[:num_sentences]
+    return np.sort(top)
 
 # ---------------------- Save Summary ----------------------
 def save_summary_to_docx(summary_text, output_filename):
@@ -69,8 +80,10 @@ def run():
         
         if st.button("Generate Summary"):
             with st.spinner("🔄 Extracting and Summarizing... Please wait..."):
-                text = extract_text(temp_file_path)
-                summary = spacy_extractive_summary(text, num_sentences=num_sentences)
+                with span("summarizer.extract"):
+                    text = extract_text(temp_file_path)
+                with span("summarizer.predict"):
+                    summary = spacy_extractive_summary(text, num_sentences=num_sentences)
 
                 st.subheader("📝 Generated Summary:")
                 st.text_area("Summary", summary, height=300)
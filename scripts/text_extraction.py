@@ -0,0 +1,107 @@
+# scripts/text_extraction.py
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+from docx import Document
+
+from scripts.instrumentation import cache_result
+
+BASE      = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.path.join(BASE, ".cache", "extracted")
+
+# PDFs with fewer pages are extracted in-process; the pool start-up isn't worth it
+PARALLEL_MIN_PAGES = 32
+# bump when extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION  = 1
+
+def file_sha256(path, block=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# ---------------------- PDF ----------------------
+def _extract_pdf_range(path, start, stop):
+    # runs in a worker process: open the PDF once per range, read each page once
+    with pdfplumber.open(path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def iter_pdf_pages(path, workers=None):
+    """Text of each PDF page in order ("" for pages without text).
+
+    Large PDFs are split into contiguous page ranges and extracted on a
+    process pool; ranges are yielded in order as soon as they are ready.
+    """
+    workers = workers or os.cpu_count() or 1
+    with pdfplumber.open(path) as pdf:
+        n_pages = len(pdf.pages)
+        if workers == 1 or n_pages < PARALLEL_MIN_PAGES:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+            return
+
+    step   = -(-n_pages // (workers * 2))
+    starts = list(range(0, n_pages, step))
+    stops  = [min(s + step, n_pages) for s in starts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for pages in pool.map(_extract_pdf_range, [path] * len(starts), starts, stops):
+            yield from pages
+
+# ---------------------- DOCX ----------------------
+def iter_docx_pages(path):
+    """A DOCX has no pages; its non-empty paragraphs form a single one."""
+    doc = Document(path)
+    yield "\n".join(para.text.strip() for para in doc.paragraphs if para.text.strip())
+
+# ---------------------- Cached Entry Points ----------------------
+def _cache_path(digest):
+    return os.path.join(CACHE_DIR, f"{digest}.v{EXTRACTOR_VERSION}.json")
+
+def iter_pages(path, use_cache=True, workers=None):
+    """Yield page texts of a PDF or DOCX, from the content-hash cache when possible.
+
+    The cache key is the file's sha256, so re-uploading the same document
+    under any name is served from ``.cache/extracted``. A fresh extraction is
+    written to the cache once the generator has been fully consumed.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        source = iter_pdf_pages(path, workers)
+    elif ext == ".docx":
+        source = iter_docx_pages(path)
+    else:
+        raise ValueError("❌ Unsupported file type. Only PDF or DOCX allowed.")
+
+    if not use_cache:
+        yield from source
+        return
+
+    cache_path = _cache_path(file_sha256(path))
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cached = None
+    cache_result("text_extraction", cached is not None)
+    if cached is not None:
+        yield from cached
+        return
+
+    pages = []
+    for page in source:
+        pages.append(page)
+        yield page
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(pages, f, ensure_ascii=False)
+    os.replace(tmp, cache_path)
+
+def extract_text(path, use_cache=True, workers=None):
+    """All non-empty pages joined by newlines."""
+    return "\n".join(page for page in iter_pages(path, use_cache, workers) if page)
@@ -0,0 +1,106 @@
+# scripts/translation_memory.py
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from scripts.instrumentation import cache_result
+
+BASE        = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR   = os.path.join(BASE, ".cache")
+MAX_ENTRIES = 200_000
+
+SPACE_RE = re.compile(r"\s+")
+
+def normalize(line):
+    """NFC-normalised line with runs of whitespace collapsed, so reflowed copies share a key."""
+    return SPACE_RE.sub(" ", unicodedata.normalize("NFC", line)).strip()
+
+def line_key(line):
+    return hashlib.sha256(normalize(line).encode("utf-8")).hexdigest()
+
+class TranslationMemory:
+    """On-disk translation memory keyed by (source language, target language, line hash).
+
+    Lookups refresh an entry's ``last_used`` time; once the table grows past
+    ``max_entries`` the least recently used entries are deleted. ``hits`` and
+    ``misses`` count lookups since the object was created.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        self.path        = path or os.path.join(CACHE_DIR, "translation_memory.sqlite3")
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self._lock       = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                " src TEXT, dest TEXT, key TEXT, source TEXT, target TEXT, last_used REAL,"
+                " PRIMARY KEY (src, dest, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used)")
+
+    def lookup(self, src, dest, keys):
+        """{key: translation} for the keys already in memory."""
+        keys, found = list(keys), {}
+        with self._lock:
+            # stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(self._conn.execute(
+                    f"SELECT key, target FROM memory WHERE src=? AND dest=? AND key IN ({marks})",
+                    [src, dest, *chunk],
+                ).fetchall())
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE memory SET last_used=? WHERE src=? AND dest=? AND key=?",
+                        [(now, src, dest, k) for k in found],
+                    )
+            self.hits   += len(found)
+            self.misses += len(keys) - len(found)
+        cache_result("translation_memory", True, len(found))
+        cache_result("translation_memory", False, len(keys) - len(found))
+        return found
+
+    def store(self, src, dest, entries):
+        """Save ``(key, source_line, translation)`` triples and evict down to ``max_entries``."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?)",
+                [(src, dest, k, s, t, now) for k, s, t in entries],
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,8 @@
+# tests/conftest.py
+#
+#   python -m pytest tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
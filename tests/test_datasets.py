@@ -0,0 +1,42 @@
+# tests/test_datasets.py
+
+import ntpath
+import os
+
+import pandas as pd
+import pytest
+
+from scripts import datasets
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("IIRA_DATASET_CACHE", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+def customers(path, n=20):
+    pd.DataFrame({
+        "Customer_ID": [f"C{i}" for i in range(n)], "Age": range(20, 20 + n),
+        "Gender": ["Male", "Female"] * (n // 2), "Total Premium Paid": [1000.5 * i for i in range(n)],
+    }).to_csv(path, index=False)
+
+def test_paths_outside_dataset_dir_are_streamed_without_a_cached_copy(tmp_path, cache):
+    customers(tmp_path / "customers.csv")
+    df = datasets.read(str(tmp_path / "customers.csv"), datasets.CS)
+    assert len(df) == 20 and isinstance(df["Gender"].dtype, pd.CategoricalDtype)
+    assert not cache.exists()
+
+def test_paths_under_dataset_dir_get_a_parquet_copy(tmp_path, cache, monkeypatch):
+    monkeypatch.setattr(datasets, "DATA_DIR", str(tmp_path))
+    customers(tmp_path / "customers.csv")
+    plain = pd.read_csv(tmp_path / "customers.csv")
+    typed = datasets.read(str(tmp_path / "customers.csv"), datasets.CS)
+    assert os.listdir(cache) == [os.path.basename(datasets.parquet_path(str(tmp_path / "customers.csv")))]
+    assert typed.astype(str).equals(plain.astype(str))
+    assert sum(len(c) for c in datasets.iter_chunks(str(tmp_path / "customers.csv"), datasets.CS, 7)) == 20
+
+def test_other_drive_is_not_under_dataset_dir(monkeypatch):
+    # Windows paths: commonpath raises ValueError across drives
+    monkeypatch.setattr(datasets.os, "path", ntpath)
+    monkeypatch.setattr(datasets, "DATA_DIR", r"C:\app\Dataset")
+    assert datasets._in_data_dir(r"D:\uploads\claims.csv") is False
+    assert datasets._in_data_dir(r"C:\app\Dataset\claims.csv") is True
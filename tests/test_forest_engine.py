@@ -0,0 +1,55 @@
+# tests/test_forest_engine.py
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from scripts.forest_engine import BULK_ROWS, CompiledForest, load_compiled
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2_000, 15))
+    y_reg = 5000 + 3000 * X[:, 0] + 1500 * X[:, 4] ** 2 + rng.normal(0, 500, len(X))
+    y_cls = np.array(["Low", "Medium", "High"])[np.digitize(X[:, 3] + 0.5 * X[:, 2], [-0.5, 0.7])]
+    return X, y_reg, y_cls
+
+@pytest.fixture(scope="module")
+def regressor(data):
+    X, y_reg, _ = data
+    return RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y_reg)
+
+@pytest.fixture(scope="module")
+def classifier(data):
+    X, _, y_cls = data
+    return RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y_cls)
+
+def test_regressor_matches_sklearn(data, regressor):
+    X = data[0][:BULK_ROWS]
+    assert np.array_equal(CompiledForest.from_sklearn(regressor).predict(X), regressor.predict(X))
+
+def test_classifier_matches_sklearn(data, classifier):
+    X        = data[0][:BULK_ROWS]
+    compiled = CompiledForest.from_sklearn(classifier)
+    assert np.array_equal(compiled.predict_proba(X), classifier.predict_proba(X))
+    assert np.array_equal(compiled.predict(X), classifier.predict(X))
+
+def test_single_row(data, regressor):
+    X = data[0][:1]
+    assert CompiledForest.from_sklearn(regressor).predict(X)[0] == regressor.predict(X)[0]
+
+def test_saved_forest_maps_back_identically(tmp_path, data, classifier):
+    X      = data[0][:100]
+    pickle = tmp_path / "model.pkl"
+    CompiledForest.from_sklearn(classifier).save(str(tmp_path / "model.forest"))
+    mapped = load_compiled(str(pickle), mmap_mode="r")
+    assert np.array_equal(mapped.predict_proba(X), classifier.predict_proba(X))
+
+def test_contributions_sum_to_prediction(data, regressor):
+    X = data[0][:50]
+    bias, contrib = CompiledForest.from_sklearn(regressor).contributions(X)
+    np.testing.assert_allclose(bias + contrib.sum(axis=1), regressor.predict(X), rtol=1e-9)
+
+def test_bulk_batches_warn(data, regressor):
+    with pytest.warns(RuntimeWarning, match="small batches"):
+        CompiledForest.from_sklearn(regressor).predict(data[0][:BULK_ROWS + 1])
@@ -0,0 +1,57 @@
+# tests/test_fraud_stream.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts import fraud_detector, model_registry
+from scripts.fraud_stream import SlidingQuantile
+
+# the docstring's bound: about one log-spaced bin, under 1% with the defaults
+REL_ERROR = 0.01
+
+def claims(n, seed=0):
+    return np.random.default_rng(seed).lognormal(mean=10.5, sigma=1.0, size=n).clip(1.0, 1e7)
+
+@pytest.mark.parametrize("q", [0.5, 0.9])
+def test_windowed_quantile_within_bound(q):
+    values    = claims(25_000)
+    estimator = SlidingQuantile(window=5_000, q=q)
+    for end in range(1_000, len(values) + 1, 1_000):
+        estimator.update(values[end - 1_000:end])
+        exact = np.quantile(values[max(0, end - 5_000):end], q)
+        assert abs(estimator.value() - exact) / exact < REL_ERROR
+
+def test_window_forgets_old_values():
+    estimator = SlidingQuantile(window=1_000)
+    estimator.update(np.full(1_000, 100.0))
+    estimator.update(np.full(1_000, 90_000.0))
+    assert abs(estimator.value() - 90_000.0) / 90_000.0 < REL_ERROR
+    assert estimator.counts.sum() == 1_000
+
+def test_batch_larger_than_window_keeps_its_tail():
+    estimator = SlidingQuantile(window=100)
+    estimator.update(np.r_[np.full(500, 10.0), np.full(100, 5_000.0)])
+    assert abs(estimator.value() - 5_000.0) / 5_000.0 < REL_ERROR
+
+def test_empty_window():
+    assert SlidingQuantile().value() is None
+
+# ---------------------- High_Claim threshold ----------------------
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("IIRA_MODELS_DIR", str(tmp_path))
+    return tmp_path
+
+def test_saved_threshold_is_the_training_median(models_dir):
+    amounts = claims(2_001, seed=3)
+    pd.DataFrame({"Policyholder_ID": range(len(amounts)), "Claim_Amount": amounts}).to_csv(
+        models_dir / "claims.csv", index=False)
+    median = fraud_detector.save_threshold(str(models_dir / "claims.csv"))
+    assert median == pytest.approx(np.median(amounts))
+    assert model_registry.registry().root == str(models_dir)
+    assert fraud_detector.high_claim_threshold() == pytest.approx(median)
+
+def test_missing_threshold_falls_back_with_a_warning(models_dir):
+    with pytest.warns(RuntimeWarning, match="stand-in"):
+        assert fraud_detector.high_claim_threshold() == fraud_detector.FALLBACK_THRESHOLD
@@ -0,0 +1,63 @@
+# tests/test_multilingual_translator.py
+
+import random
+import threading
+import time
+
+import pytest
+
+from scripts import multilingual_translator as mt
+from scripts.translation_memory import TranslationMemory
+
+class FakeBackend:
+    """Upper-cases text after a random delay; any text containing "fail" raises."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock  = threading.Lock()
+
+    def translate(self, text):
+        with self.lock:
+            self.calls.append(text)
+        time.sleep(random.uniform(0, 0.005))  # so batches finish out of order
+        if "fail" in text:
+            raise RuntimeError("backend error")
+        return text.upper()
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(mt.time, "sleep", lambda s: None)
+
+def test_order_is_preserved_across_batches():
+    lines = [f"line {i}" for i in range(200)]
+    out   = mt.translate_lines(lines, FakeBackend(), max_workers=8, max_chars=40)
+    assert out == [line.upper() for line in lines]
+
+def test_failed_lines_come_back_as_none():
+    lines = ["alpha", "this will fail", "beta", "gamma", "fail again"]
+    out   = mt.translate_lines(lines, FakeBackend(), max_chars=20, retries=2, delay=0)
+    assert out == ["ALPHA", None, "BETA", "GAMMA", None]
+
+def test_batches_respect_the_character_limit():
+    lines   = [("x" * 30) + str(i) for i in range(50)]
+    batches = mt.pack_batches(lines, max_chars=100)
+    assert [line for b in batches for line in b] == lines
+    assert all(len("\n".join(b)) <= 100 for b in batches)
+
+def test_progress_reaches_the_total():
+    seen = []
+    mt.translate_lines([f"l{i}" for i in range(30)], FakeBackend(), max_chars=10,
+                       progress=lambda done, total: seen.append((done, total)))
+    assert seen[-1] == (30, 30)
+
+def test_failed_lines_are_not_remembered(tmp_path):
+    memory  = TranslationMemory(str(tmp_path / "memory.sqlite3"))
+    text    = "hello\nplease fail\nhello\nworld"
+    stats   = {}
+    out     = mt.translate_text(text, "en", "fr", backend=FakeBackend(), memory=memory, stats=stats)
+    assert out.split("\n\n") == ["HELLO", "please fail", "HELLO", "WORLD"]
+    assert stats["failed"] == 1 and stats["sent"] == 3
+
+    backend = FakeBackend()
+    mt.translate_text(text, "en", "fr", backend=backend, memory=memory)
+    assert backend.calls and all("fail" in call for call in backend.calls)
@@ -0,0 +1,86 @@
+# tests/test_review_index.py
+
+import os
+import random
+
+import pytest
+
+from scripts import review_index
+from scripts.review_index import ReviewWordIndex
+
+HEADER = "Review_ID,Sentiment_Label,Review_Text\n"
+LAST   = 'R29,Positive,"claim claim claim"\n'
+WORDS  = ["claim", "settled", "quickly", "agent", "rude", "premium", "renewal", "smooth", "delay", "helpful"]
+
+def rows(start, n, seed):
+    rng = random.Random(seed)
+    return "".join(
+        f'R{i},{rng.choice(["Positive", "Negative", "Neutral"])},"{" ".join(rng.choices(WORDS, k=6))}"\n'
+        for i in range(start, start + n)
+    )
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # so the checked tail is a small part of the file
+    monkeypatch.setattr(review_index, "BLOCK", 64)
+
+def rebuilt(path, tmp_path):
+    index = ReviewWordIndex(str(path), index_path=str(tmp_path / "fresh.json"))
+    index.update()
+    return index
+
+def write(path, text, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.write(text)
+
+def test_appends_match_full_rebuild(tmp_path):
+    path = tmp_path / "reviews.csv"
+    write(path, HEADER + rows(0, 50, 1))
+    index = ReviewWordIndex(str(path), index_path=str(tmp_path / "index.json"))
+    assert index.update() == 50
+
+    for step in range(1, 4):
+        write(path, rows(50 * step, 50, step + 1), "a")
+        assert index.update() == 50
+    assert index.update() == 0
+
+    fresh = rebuilt(path, tmp_path)
+    assert index.rows == fresh.rows == 200
+    assert index.counts == fresh.counts
+
+def test_partial_last_line_waits_for_the_rest(tmp_path):
+    path = tmp_path / "reviews.csv"
+    line = rows(10, 1, 5)
+    write(path, HEADER + rows(0, 10, 4) + line[:7])
+    index = ReviewWordIndex(str(path), index_path=str(tmp_path / "index.json"))
+    assert index.update() == 10
+    write(path, line[7:], "a")
+    assert index.update() == 1
+    assert index.counts == rebuilt(path, tmp_path).counts
+
+def test_state_survives_reload(tmp_path):
+    path = tmp_path / "reviews.csv"
+    write(path, HEADER + rows(0, 20, 1))
+    ReviewWordIndex(str(path), index_path=str(tmp_path / "index.json")).update()
+    write(path, rows(20, 5, 2), "a")
+    index = ReviewWordIndex(str(path), index_path=str(tmp_path / "index.json"))
+    assert index.update() == 5
+    assert index.counts == rebuilt(path, tmp_path).counts
+
+@pytest.mark.parametrize("rewrite", [
+    lambda text: text.replace(LAST, 'R29,Negative,"delay delay delay"\n'),  # same-size edit of the last row
+    lambda text: text[: len(text) // 2],                                    # truncation
+    lambda text: HEADER + rows(0, 40, 9),                                   # replaced by a longer file
+])
+def test_rewrites_trigger_a_rebuild(tmp_path, rewrite):
+    path = tmp_path / "reviews.csv"
+    text = HEADER + rows(0, 29, 3) + LAST
+    write(path, text)
+    index = ReviewWordIndex(str(path), index_path=str(tmp_path / "index.json"))
+    index.update()
+    write(path, rewrite(text))
+    # the coarse filesystem clock may not tick between the two writes
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    index.update()
+    assert index.counts == rebuilt(path, tmp_path).counts
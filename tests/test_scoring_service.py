@@ -0,0 +1,63 @@
+# tests/test_scoring_service.py
+
+import asyncio
+import json
+
+from scripts.scoring_service import MicroBatcher, ScoringServer
+
+CLAIM = {"Claim_Amount": 12_000.0, "Claim_Type": "Medical", "Suspicious_Flags": "No"}
+
+def fake_fraud(records):
+    # stands in for score_fraud without the model files
+    for r in records:
+        if r["Claim_Type"] == "boom":
+            raise RuntimeError("model crashed")
+        r["Suspicious_Flags"]  # KeyError like SCHEMA.transform for a missing column
+    return [{"prediction": "Normal"} for _ in records]
+
+def post(*bodies, score_fn=fake_fraud):
+    """(status, payload) for each body POSTed to /predict/fraud concurrently."""
+    async def main():
+        batcher = MicroBatcher("fraud", score_fn, max_wait=0.01)
+        worker  = asyncio.create_task(batcher.worker())
+        server  = ScoringServer({"fraud": batcher})
+        try:
+            return await asyncio.gather(*[
+                server.route("POST", "/predict/fraud", json.dumps(b).encode("utf-8")) for b in bodies
+            ])
+        finally:
+            worker.cancel()
+    return asyncio.run(main())
+
+def test_valid_record():
+    [(status, payload)] = post(CLAIM)
+    assert status == 200 and payload == {"prediction": "Normal"}
+
+def test_null_field_is_a_client_error():
+    [(status, payload)] = post({**CLAIM, "Claim_Amount": None})
+    assert status == 400
+    assert "Claim_Amount" in payload["error"]
+
+def test_string_field_is_a_client_error():
+    [(status, _)] = post({**CLAIM, "Claim_Amount": "a lot"})
+    assert status == 400
+
+def test_numeric_string_bool_and_nan_are_rejected():
+    bodies = [{**CLAIM, "Claim_Amount": "12000"}, {**CLAIM, "High_Claim": True}, {**CLAIM, "Claim_Amount": float("nan")}]
+    assert [s for s, _ in post(*bodies)] == [400, 400, 400]
+
+def test_missing_column_is_a_client_error():
+    [(status, _)] = post({"Claim_Amount": 1.0, "Claim_Type": "Medical"})
+    assert status == 400
+
+def test_malformed_body():
+    assert post([])[0][0] == 400
+    assert post("not an object")[0][0] == 400
+
+def test_scorer_failure_is_a_server_error():
+    [(status, _)] = post({**CLAIM, "Claim_Type": "boom"})
+    assert status == 500
+
+def test_bad_request_does_not_fail_its_batch():
+    statuses = [s for s, _ in post(CLAIM, {"Claim_Amount": 1.0, "Claim_Type": "Medical"}, [CLAIM, CLAIM])]
+    assert statuses == [200, 400, 200]